@@ -1,19 +1,115 @@
-from flask import Flask, jsonify
+import contextlib
+import os
+import time
+import json
+from flask import Flask, Response, g, jsonify, request, stream_with_context
 from flask_cors import CORS 
-from api.gold_forecaster import scrape_gold_data, process_and_forecast
+from api.batch_forecast import forecast_many
+from api.gold_forecaster import cached_scrape_gold_data, forecast_frames, process_and_forecast
+from api.history_store import history_enabled, history_frames
+from api.metrics import get_metrics, profiled
+from api.model_state import get_model_state_store
+from api.process_local import ProcessLocal
+from api.response_cache import LAYOUTS, PreparedResponse, ResponseCache
+from api.scheduler import RefreshScheduler
+from api.single_flight import get_single_flight
+from api.tuning_cache import get_tuning_cache
 app = Flask(__name__)
 CORS(app) 
+_responses = ResponseCache(dumps=app.json.dumps)
+_scheduler = ProcessLocal(lambda: RefreshScheduler(refresh_forecast).start())
+def refresh_forecast(backends=None):
+    """Scrape (through the cache) and run the forecast, once across concurrent workers; None when either step fails"""
+    with get_metrics().stage('refresh'), profiled('refresh'):
+        forecast_results = get_single_flight().do('forecast', lambda: _scrape_and_forecast(backends))
+    get_metrics().inc('gold_refresh_total', result='success' if forecast_results is not None else 'failure')
+    return forecast_results
+def _scrape_and_forecast(backends=None):
+    # The refresh is the only reader of the scrape and already runs off the request path, so an
+    # expired scrape is refetched here rather than published an interval late.
+    daily_data, monthly_data = cached_scrape_gold_data(backends=backends, allow_stale=False)
+    if daily_data is None or monthly_data is None:
+        print("Failed to scrape data.")
+        return None
+    if history_enabled() and daily_data and monthly_data:
+        with get_metrics().stage('build_frames'):
+            daily_df, monthly_df = history_frames(daily_data, monthly_data)
+        forecast_results = forecast_frames(daily_df, monthly_df, get_model_state_store(), tuning_cache=get_tuning_cache(),
+                                           data_rows=(len(daily_data), len(monthly_data)))
+    else:
+        forecast_results = process_and_forecast(daily_data, monthly_data, state_store=get_model_state_store(),
+                                                tuning_cache=get_tuning_cache())
+    if forecast_results is None:
+        print("Failed to process data or generate forecast.")
+    return forecast_results
+def get_scheduler():
+    """Per-process refresh scheduler, started lazily so it runs inside each forked worker"""
+    return _scheduler.get()
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    g.request_profile = contextlib.ExitStack()
+    g.request_profile.enter_context(profiled(request.path))
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    get_metrics().observe('gold_http_request_duration_seconds', time.perf_counter() - g.request_started,
+                          method=request.method, endpoint=endpoint, status=str(response.status_code))
+    return response
+@app.teardown_request
+def stop_request_profile(error=None):
+    profile = g.pop('request_profile', None)
+    if profile is not None:
+        profile.close()
+@app.route('/metrics')
+def metrics():
+    return Response(get_metrics().render(), mimetype='text/plain; version=0.0.4')
 @app.route('/')
 def index():
     return jsonify({"message": "Backend is running!"})
 @app.route('/forecast')
 def get_gold_forecast():
-    daily_data, monthly_data = scrape_gold_data()
-    if daily_data is None or monthly_data is None:
-        return jsonify({"error": "Failed to scrape data."}), 500
-    forecast_results = process_and_forecast(daily_data, monthly_data)
-    if forecast_results is None:
-        return jsonify({"error": "Failed to process data or generate forecast."}), 500
-    return jsonify(forecast_results)
+    scheduler = get_scheduler()
+    snapshot = scheduler.snapshot or scheduler.wait_for_snapshot(timeout=float(os.environ.get('GOLD_FIRST_SNAPSHOT_TIMEOUT', 120)))
+    if snapshot is None:
+        return jsonify({"error": "Failed to scrape data or generate forecast."}), 500
+    layout = request.args.get('layout', 'records')
+    if layout not in LAYOUTS:
+        return jsonify({"error": f"Unknown layout '{layout}'."}), 400
+    prepared = _responses.get(snapshot, layout, lambda snap: dict(snap.results, generated_at=snap.generated_at.isoformat()))
+    encoding = PreparedResponse.negotiate(request.headers.get('Accept-Encoding'))
+    etag = prepared.etag_for(encoding)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+    if request.if_none_match.contains_weak(etag.strip('"')):
+        return Response(status=304, headers=headers)
+    if encoding != 'identity':
+        headers['Content-Encoding'] = encoding
+    return Response(prepared.encoded(encoding), mimetype='application/json', headers=headers)
+@app.route('/forecast/batch', methods=['POST'])
+def get_batch_forecast():
+    """Tune and forecast many series with the daily model search; streams one JSON line per series"""
+    payload = request.get_json(silent=True) or {}
+    series = payload.get('series')
+    max_series = int(os.environ.get('GOLD_BATCH_MAX_SERIES', 100))
+    max_horizon = int(os.environ.get('GOLD_BATCH_MAX_HORIZON', 365))
+    max_observations = int(os.environ.get('GOLD_BATCH_MAX_OBSERVATIONS', 10000))
+    if not isinstance(series, list) or not series or not all(isinstance(item, dict) for item in series):
+        return jsonify({"error": "Request body must contain a non-empty 'series' list of objects."}), 400
+    if len(series) > max_series:
+        return jsonify({"error": f"At most {max_series} series per request."}), 400
+    if any(isinstance(item.get('values'), list) and len(item['values']) > max_observations for item in series):
+        return jsonify({"error": f"At most {max_observations} observations per series."}), 413
+    try:
+        horizon = int(payload.get('horizon', 3))
+        test_size = int(payload.get('test_size', 3))
+        horizons = [int(item.get('horizon', horizon)) for item in series]
+    except (TypeError, ValueError):
+        return jsonify({"error": "'horizon' and 'test_size' must be integers."}), 400
+    if test_size < 1 or max(horizons) > max_horizon:
+        return jsonify({"error": f"'test_size' must be at least 1 and horizons at most {max_horizon}."}), 400
+    def generate():
+        for result in forecast_many(series, horizon=horizon, test_size=test_size, tuning_cache=get_tuning_cache()):
+            yield json.dumps(result, separators=(',', ':')) + '\n'
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
 if __name__ == '__main__':
     print("Flask app ready to run. Use a WSGI server like Gunicorn to start it.")
@@ -0,0 +1,124 @@
+import asyncio
+import datetime
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+from werkzeug.http import parse_etags
+from api.app import refresh_forecast
+from api.metrics import get_metrics
+from api.response_cache import LAYOUTS, PreparedResponse, ResponseCache
+from api.scheduler import RefreshScheduler
+def _json_default(value):
+    """Dates as HTTP dates, like Flask's JSON provider, so both services produce identical bodies and ETags"""
+    if isinstance(value, datetime.date):
+        from werkzeug.http import http_date
+        return http_date(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+def dumps(obj):
+    return json.dumps(obj, default=_json_default, ensure_ascii=True, sort_keys=True)
+class ForecastService:
+    """Serves forecast snapshots from one asyncio event loop while refreshes run off-loop.
+
+    The refresh job (scrape with the GOLD_SCRAPER_BACKENDS backends, history merge, tuning) runs in a
+    single-thread executor, so the loop keeps serving while the page downloads. Requests never block on a
+    refresh: they read the latest published snapshot, waiting only for the first one after boot.
+    """
+    def __init__(self, executor=None):
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix='forecast-refresh')
+        self.scheduler = None
+        self.responses = ResponseCache(dumps=dumps)
+        self._ready = None
+        self._task = None
+    def start(self):
+        if self._task is None or self._task.done():
+            loop = asyncio.get_running_loop()
+            self.scheduler = RefreshScheduler(refresh_forecast)
+            self._ready = asyncio.Event()
+            self._task = loop.create_task(self._refresh_loop())
+        return self
+    async def _refresh_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await loop.run_in_executor(self.executor, self.scheduler.refresh_now)
+            self._ready.set()
+            await asyncio.sleep(self.scheduler.seconds_until_next_run())
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=False)
+    async def snapshot(self, timeout):
+        self.start()
+        if self.scheduler.snapshot is None:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.scheduler.snapshot
+service = ForecastService()
+async def _send(send, status, body, content_type='application/json', headers=None):
+    header_list = [(b'content-type', content_type.encode('latin-1')), (b'content-length', str(len(body)).encode('latin-1'))]
+    header_list += [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in (headers or {}).items()]
+    await send({'type': 'http.response.start', 'status': status, 'headers': header_list})
+    await send({'type': 'http.response.body', 'body': body})
+async def _send_json(send, status, payload):
+    await _send(send, status, json.dumps(payload).encode('utf-8'))
+async def forecast(scope, send, headers):
+    snapshot = await service.snapshot(timeout=float(os.environ.get('GOLD_FIRST_SNAPSHOT_TIMEOUT', 120)))
+    if snapshot is None:
+        return await _send_json(send, 500, {"error": "Failed to scrape data or generate forecast."})
+    layout = parse_qs(scope.get('query_string', b'').decode('latin-1')).get('layout', ['records'])[0]
+    if layout not in LAYOUTS:
+        return await _send_json(send, 400, {"error": f"Unknown layout '{layout}'."})
+    prepared = service.responses.get(snapshot, layout, lambda snap: dict(snap.results, generated_at=snap.generated_at.isoformat()))
+    encoding = PreparedResponse.negotiate(headers.get('accept-encoding'))
+    etag = prepared.etag_for(encoding)
+    response_headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+    if_none_match = headers.get('if-none-match', '')
+    if parse_etags(if_none_match).contains_weak(etag.strip('"')):
+        return await _send(send, 304, b'', headers=response_headers)
+    if encoding != 'identity':
+        response_headers['Content-Encoding'] = encoding
+    await _send(send, 200, prepared.encoded(encoding), headers=response_headers)
+async def index(scope, send, headers):
+    await _send_json(send, 200, {"message": "Backend is running!"})
+async def metrics(scope, send, headers):
+    await _send(send, 200, get_metrics().render().encode('utf-8'), content_type='text/plain; version=0.0.4')
+ROUTES = {'/': index, '/forecast': forecast, '/metrics': metrics}
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            service.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await service.stop()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+async def app(scope, receive, send):
+    """ASGI application exposing the /forecast contract of api.app (GET /, /forecast and /metrics)"""
+    if scope['type'] == 'lifespan':
+        return await _lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+    started = time.perf_counter()
+    handler = ROUTES.get(scope['path'])
+    statuses = []
+    async def send_and_record(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+        await send(message)
+    if handler is None:
+        await _send_json(send_and_record, 404, {"error": "Not Found"})
+    elif scope['method'] != 'GET':
+        await _send_json(send_and_record, 405, {"error": "Method Not Allowed"})
+    else:
+        headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+        await handler(scope, send_and_record, headers)
+    get_metrics().observe('gold_http_request_duration_seconds', time.perf_counter() - started, method=scope['method'],
+                          endpoint=scope['path'] if handler is not None else 'unmatched', status=str(statuses[0] if statuses else 500))
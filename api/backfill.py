@@ -0,0 +1,331 @@
+"""Offline batch forecasting over archived daily/monthly data files, resumable and fanned out over processes.
+
+Inputs are files or directories of .xlsx, .csv or .parquet files shaped like ML/daily_gold.xlsx
+(Date, Price_per_gram) and ML/monthly_gold.xlsx (Month, ..., Average_per_gram). Files in one
+directory whose names match once 'daily'/'monthly' is removed form one snapshot, e.g.
+archive/2025-05-29/daily.csv + monthly.csv or ML/daily_gold.xlsx + ML/monthly_gold.xlsx.
+
+    python -m api.backfill ML --output forecasts
+    python -m api.backfill archive --output forecasts --workers 8 --chunk-size 1000
+
+Part files only hold snapshots that were forecast; failures are kept in the checkpoint and retried by
+the next run. A snapshot whose files changed has its old row removed before it is forecast again.
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from api.gold_forecaster import forecast_frames
+from api.ingest import parse_daily_dates, parse_months, parse_prices
+from api.sqlite_store import connect
+INPUT_SUFFIXES = ('.xlsx', '.csv', '.parquet')
+OUTPUT_FORMATS = ('parquet', 'jsonl')
+CHECKPOINT_NAME = 'checkpoint.sqlite3'
+DAILY_COLUMNS = ('Date', 'Price_per_gram')
+MONTHLY_COLUMNS = ('Month', 'Start_per_gram', 'End_per_gram', 'Change_Rs', 'Percent_change', 'Average_per_gram')
+RESULT_FIELDS = ('daily_modelType', 'daily_alpha', 'daily_beta', 'daily_phi', 'daily_rmse', 'daily_mae',
+                 'daily_forecast', 'daily_forecast_lower', 'daily_forecast_upper',
+                 'monthly_modelType', 'monthly_alpha', 'monthly_beta', 'monthly_phi', 'monthly_rmse', 'monthly_mae',
+                 'monthly_forecast', 'monthly_forecast_lower', 'monthly_forecast_upper', 'interval_level', 'interval_method')
+OUTPUT_COLUMNS = (('snapshot', 'signature', 'daily_files', 'monthly_files', 'daily_observations', 'monthly_observations', 'last_date')
+                  + RESULT_FIELDS + ('computed_at', 'error'))
+_KIND = re.compile(r'daily|monthly', re.IGNORECASE)
+_PART = re.compile(r'^part-\d{5}\.(parquet|jsonl)(\.tmp)?$')
+def _signature(paths):
+    digest = hashlib.sha1()
+    for path in sorted(paths):
+        stat = os.stat(path)
+        digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+def discover_snapshots(inputs):
+    """Group input files into {key: {'daily', 'monthly', 'signature'}} snapshots, sorted by key.
+
+    The key is the file's directory joined with its name minus 'daily'/'monthly'; the signature
+    changes when any file in the snapshot is modified, so a resumed run recomputes it.
+    """
+    files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        else:
+            files.append(path)
+    snapshots = {}
+    for path in files:
+        stem, suffix = os.path.splitext(os.path.basename(path))
+        if suffix.lower() not in INPUT_SUFFIXES or stem.startswith('~$'):
+            continue
+        match = _KIND.search(stem)
+        if match is None:
+            print(f"Skipping {path}: its name contains neither 'daily' nor 'monthly'")
+            continue
+        directory = os.path.dirname(os.path.abspath(path))
+        name = (stem[:match.start()] + stem[match.end():]).strip('_-. ')
+        snapshot = snapshots.setdefault(os.path.join(directory, name) if name else directory, {'daily': [], 'monthly': []})
+        snapshot[match.group(0).lower()].append(os.path.abspath(path))
+    for snapshot in snapshots.values():
+        snapshot['signature'] = _signature(snapshot['daily'] + snapshot['monthly'])
+    return dict(sorted(snapshots.items()))
+def read_table(path, columns, chunk_rows=100_000):
+    """The wanted `columns` present in one xlsx, CSV or Parquet file, as an iterator of frames; CSVs come `chunk_rows` rows at a time"""
+    import pandas as pd
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == '.csv':
+        return pd.read_csv(path, usecols=lambda column: column in columns, chunksize=chunk_rows)
+    if suffix == '.parquet':
+        frame = pd.read_parquet(path)
+        return iter([frame[[column for column in frame.columns if column in columns]]])
+    return iter([pd.read_excel(path, usecols=lambda column: column in columns)])
+def _dates(column, parse):
+    import pandas as pd
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.to_numpy(dtype='datetime64[ns]')
+    return parse(column.astype(str).tolist())
+def _prices(column):
+    import pandas as pd
+    if pd.api.types.is_numeric_dtype(column):
+        return column.to_numpy(dtype='float64')
+    return parse_prices(column.astype(str).tolist())
+def _daily_frame(daily):
+    import pandas as pd
+    return pd.DataFrame({'Price_per_gram': _prices(daily['Price_per_gram'])},
+                        index=pd.DatetimeIndex(_dates(daily['Date'], parse_daily_dates), name='Date'))
+def _monthly_frame(monthly):
+    import pandas as pd
+    return pd.DataFrame({
+        'Month': monthly['Month'].to_numpy(),
+        'Start_per_gram': _prices(monthly['Start_per_gram']) if 'Start_per_gram' in monthly else None,
+        'End_per_gram': _prices(monthly['End_per_gram']) if 'End_per_gram' in monthly else None,
+        'Change_Rs': monthly['Change_Rs'].to_numpy() if 'Change_Rs' in monthly else None,
+        'Percent_change': monthly['Percent_change'].to_numpy() if 'Percent_change' in monthly else None,
+        'Average_per_gram': _prices(monthly['Average_per_gram']),
+    }, index=pd.DatetimeIndex(_dates(monthly['Month'], parse_months), name='Date'))
+def load_frames(snapshot, chunk_rows=100_000):
+    """Daily and monthly frames shaped like build_frames' output, built from typed columns without per-row records.
+
+    Each chunk read from a file is converted to typed columns before the next one is read, so only
+    one chunk of raw text is held at a time however large the CSV is.
+    """
+    import pandas as pd
+    daily_df = pd.concat([_daily_frame(chunk) for path in snapshot['daily'] for chunk in read_table(path, DAILY_COLUMNS, chunk_rows)])
+    monthly_df = pd.concat([_monthly_frame(chunk) for path in snapshot['monthly']
+                            for chunk in read_table(path, MONTHLY_COLUMNS, chunk_rows)])
+    daily_df = daily_df[~daily_df.index.duplicated(keep='last')].sort_index()
+    monthly_df = monthly_df[~monthly_df.index.duplicated(keep='last')].sort_index()
+    return daily_df, monthly_df
+def _cell(value):
+    return None if value == "N/A" else value
+def forecast_snapshot(key, snapshot, daily_horizon=3, monthly_horizon=3, chunk_rows=100_000):
+    """Forecast one snapshot into a flat output row; failures are reported in its 'error' field"""
+    row = dict.fromkeys(OUTPUT_COLUMNS)
+    row.update(snapshot=key, signature=snapshot['signature'], daily_files=snapshot['daily'], monthly_files=snapshot['monthly'])
+    try:
+        if not snapshot['daily'] or not snapshot['monthly']:
+            raise ValueError("snapshot needs both a daily and a monthly file")
+        with contextlib.redirect_stdout(io.StringIO()):
+            daily_df, monthly_df = load_frames(snapshot, chunk_rows)
+            results = forecast_frames(daily_df, monthly_df, daily_horizon=daily_horizon, monthly_horizon=monthly_horizon,
+                                      include_data=False)
+        row.update(daily_observations=int(daily_df['Price_per_gram'].notna().sum()), monthly_observations=len(monthly_df),
+                   last_date=daily_df.index[-1].date().isoformat() if len(daily_df) else None)
+        row.update({field: _cell(results[field]) for field in RESULT_FIELDS})
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+    row['computed_at'] = time.time()
+    return row
+def _init_worker():
+    os.environ['GOLD_SEARCH_WORKERS'] = '1'
+def forecast_all(pending, workers, **options):
+    """Yield output rows for (key, snapshot) pairs as they finish, with at most four tasks per worker in flight"""
+    if workers <= 1:
+        for key, snapshot in pending:
+            yield forecast_snapshot(key, snapshot, **options)
+        return
+    queued = iter(pending)
+    running = set()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'), initializer=_init_worker) as executor:
+        while True:
+            for key, snapshot in queued:
+                running.add(executor.submit(forecast_snapshot, key, snapshot, **options))
+                if len(running) >= workers * 4:
+                    break
+            if not running:
+                return
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield future.result()
+class Checkpoint:
+    """SQLite record of the part files written, the snapshot signatures each one covers, and failed snapshots.
+
+    A part is recorded only after it has been renamed into place, so after an interruption every
+    recorded snapshot is on disk and anything else (including stray part files) is redone. Failed
+    snapshots are kept apart from the parts so that the next run retries them.
+    """
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS parts (name TEXT PRIMARY KEY, rows INTEGER NOT NULL, written_at REAL NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS snapshots (key TEXT PRIMARY KEY, signature TEXT NOT NULL, part TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS failures (key TEXT PRIMARY KEY, signature TEXT NOT NULL, error TEXT NOT NULL, "
+                         "failed_at REAL NOT NULL)")
+    def _connect(self):
+        return connect(self.path)
+    def signatures(self):
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT key, signature FROM snapshots").fetchall())
+    def parts(self):
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT name FROM parts ORDER BY name")]
+    def record(self, part, rows):
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT INTO parts (name, rows, written_at) VALUES (?, ?, ?)", (part, len(rows), time.time()))
+            conn.executemany("INSERT OR REPLACE INTO snapshots (key, signature, part) VALUES (?, ?, ?)",
+                             [(row['snapshot'], row['signature'], part) for row in rows])
+            conn.executemany("DELETE FROM failures WHERE key = ?", [(row['snapshot'],) for row in rows])
+            conn.execute("COMMIT")
+    def record_failure(self, row):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO failures (key, signature, error, failed_at) VALUES (?, ?, ?, ?)",
+                         (row['snapshot'], row['signature'], row['error'], row['computed_at']))
+    def failures(self):
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT key, error FROM failures").fetchall())
+    def superseded(self, keys):
+        """{part: [key, ...]} for the given snapshot keys that already have a row in a part"""
+        by_part = {}
+        with self._connect() as conn:
+            for key in keys:
+                row = conn.execute("SELECT part FROM snapshots WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    by_part.setdefault(row[0], []).append(key)
+        return by_part
+    def drop(self, part, keys, rows):
+        """Forget `keys`, now removed from `part`, which has `rows` rows left (0 removes the part)"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("DELETE FROM snapshots WHERE key = ? AND part = ?", [(key, part) for key in keys])
+            if rows:
+                conn.execute("UPDATE parts SET rows = ? WHERE name = ?", (rows, part))
+            else:
+                conn.execute("DELETE FROM parts WHERE name = ?", (part,))
+            conn.execute("COMMIT")
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM parts")
+            conn.execute("DELETE FROM snapshots")
+            conn.execute("DELETE FROM failures")
+def remove_unrecorded_parts(output, checkpoint):
+    """Delete part files the checkpoint does not know about, left behind by an interrupted run"""
+    recorded = set(checkpoint.parts())
+    for name in sorted(os.listdir(output)):
+        if _PART.match(name) and name not in recorded:
+            print(f"Removing unrecorded {name}")
+            os.remove(os.path.join(output, name))
+def _part_index(name):
+    return int(name.split('.')[0][len('part-'):])
+def read_part(output, name):
+    """Rows of one part file as dicts"""
+    path = os.path.join(output, name)
+    if name.endswith('.parquet'):
+        import pandas as pd
+        return pd.read_parquet(path).to_dict(orient='records')
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+def drop_superseded_rows(output, checkpoint, keys):
+    """Remove the rows of `keys` from the parts that hold them, so a recomputed snapshot is not written twice"""
+    for part, part_keys in checkpoint.superseded(keys).items():
+        path = os.path.join(output, part)
+        dropped = set(part_keys)
+        remaining = [row for row in read_part(output, part) if row['snapshot'] not in dropped] if os.path.exists(path) else []
+        if remaining:
+            write_part(output, _part_index(part), remaining, part.rsplit('.', 1)[1])
+        elif os.path.exists(path):
+            os.remove(path)
+        checkpoint.drop(part, part_keys, len(remaining))
+        print(f"Removed {len(part_keys)} superseded rows from {part}")
+def write_part(output, index, rows, output_format):
+    """Write `rows` to part-<index>.<format> via a temporary file and return the part's name"""
+    name = f"part-{index:05d}.{output_format}"
+    path = os.path.join(output, name)
+    if output_format == 'parquet':
+        import pandas as pd
+        pd.DataFrame(rows, columns=OUTPUT_COLUMNS).to_parquet(path + '.tmp', index=False)
+    else:
+        with open(path + '.tmp', 'w') as f:
+            f.writelines(json.dumps({column: row[column] for column in OUTPUT_COLUMNS}) + '\n' for row in rows)
+    os.replace(path + '.tmp', path)
+    return name
+def _check_parquet_engine():
+    for module in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            pass
+    return False
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='+', help="data files or directories to scan recursively")
+    parser.add_argument('--output', '-o', required=True, help="directory for part files and the checkpoint")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='parquet')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('GOLD_BACKFILL_WORKERS', 0)),
+                        help="worker processes (0 uses every core, 1 runs in-process)")
+    parser.add_argument('--chunk-size', type=int, default=500, help="snapshots per part file and checkpoint")
+    parser.add_argument('--daily-horizon', type=int, default=3)
+    parser.add_argument('--monthly-horizon', type=int, default=3)
+    parser.add_argument('--read-chunk-rows', type=int, default=100_000, help="rows per CSV read")
+    parser.add_argument('--restart', action='store_true', help="forget the checkpoint and recompute every snapshot")
+    args = parser.parse_args(argv)
+    if args.format == 'parquet' and not _check_parquet_engine():
+        parser.error("Parquet output needs pyarrow (pip install pyarrow); alternatively pass --format jsonl")
+    os.makedirs(args.output, exist_ok=True)
+    checkpoint = Checkpoint(os.path.join(args.output, CHECKPOINT_NAME))
+    if args.restart:
+        checkpoint.clear()
+    remove_unrecorded_parts(args.output, checkpoint)
+    snapshots = discover_snapshots(args.inputs)
+    done = checkpoint.signatures()
+    pending = [(key, snapshot) for key, snapshot in snapshots.items() if done.get(key) != snapshot['signature']]
+    retried = len(set(checkpoint.failures()) & {key for key, _ in pending})
+    drop_superseded_rows(args.output, checkpoint, [key for key, _ in pending])
+    workers = os.cpu_count() or 1 if args.workers == 0 else max(args.workers, 1)
+    print(f"{len(snapshots)} snapshots, {len(snapshots) - len(pending)} already done, {len(pending)} to forecast "
+          f"({retried} failed before) on {workers} workers")
+    next_part = max(map(_part_index, checkpoint.parts()), default=-1) + 1
+    buffer, finished, written, failures = [], 0, 0, 0
+    started = time.perf_counter()
+    def flush():
+        nonlocal next_part, written
+        if buffer:
+            part = write_part(args.output, next_part, buffer, args.format)
+            checkpoint.record(part, buffer)
+            next_part += 1
+            written += len(buffer)
+            print(f"Wrote {part} ({finished}/{len(pending)} snapshots, {finished / (time.perf_counter() - started):.1f}/s)")
+            buffer.clear()
+    for row in forecast_all(pending, workers, daily_horizon=args.daily_horizon, monthly_horizon=args.monthly_horizon,
+                            chunk_rows=args.read_chunk_rows):
+        finished += 1
+        if row['error'] is not None:
+            failures += 1
+            checkpoint.record_failure(row)
+            print(f"{row['snapshot']}: {row['error']}")
+            continue
+        buffer.append(row)
+        if len(buffer) >= args.chunk_size:
+            flush()
+    flush()
+    print(f"Finished {finished} snapshots in {time.perf_counter() - started:.1f}s, {written} written, {failures} failed"
+          + (" (retried on the next run)" if failures else ""))
+    return 1 if failures else 0
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import os
+import numpy as np
+from api.holt_batch import forecast_holt_batch
+def backtest_folds():
+    """Rolling origins used for model selection, from GOLD_BACKTEST_FOLDS (1 is the single holdout)"""
+    return max(int(os.environ.get('GOLD_BACKTEST_FOLDS', 1)), 1)
+def rolling_origins(n, horizon, folds, step=None, min_train=2):
+    """Forecast origins (train lengths) for `folds` rolling windows ending at the last observation.
+
+    The last origin is n - horizon, i.e. the usual single holdout; earlier ones step back by `step`
+    (default `horizon`). Origins that would leave fewer than `min_train` training points are dropped.
+    """
+    step = step or horizon
+    origins = [n - horizon - k * step for k in range(folds)]
+    return np.array(sorted(origin for origin in origins if origin >= min_train), dtype=np.int64)
+def rolling_origin_backtest(values, alpha, beta, phi, folds=5, horizon=3, step=None, start=1):
+    """Score every candidate on `folds` rolling origins in a single pass over the series.
+
+    Holt's state after consuming y[:origin] is exactly the model fitted on that prefix, so it is
+    captured as the recursion passes each origin instead of refitting per fold. Returns the
+    origins, per-fold (candidates, folds) RMSE/MAE, and pooled RMSE/MAE over all fold errors.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    alpha = np.asarray(alpha, dtype=np.float64)
+    beta = np.asarray(beta, dtype=np.float64)
+    phi = np.asarray(phi, dtype=np.float64)
+    n = len(values)
+    origins = rolling_origins(n, horizon, folds, step)
+    if len(origins) == 0:
+        raise ValueError(f"Series of {n} points is too short for a {horizon}-step backtest")
+    fold_rmse = np.empty(alpha.shape + (len(origins),))
+    fold_mae = np.empty_like(fold_rmse)
+    squared_sum = np.zeros(alpha.shape)
+    absolute_sum = np.zeros(alpha.shape)
+    level = np.full(alpha.shape, values[0])
+    trend = np.full(alpha.shape, values[1] - values[0])
+    one_minus_alpha = 1 - alpha
+    damped_beta = (1 - beta) * phi
+    fold = 0
+    for t in range(start, origins[-1]):
+        prev_level = level
+        level = alpha * values[t] + one_minus_alpha * (prev_level + phi * trend)
+        trend = beta * (level - prev_level) + damped_beta * trend
+        while fold < len(origins) and origins[fold] == t + 1:
+            errors = values[t + 1:t + 1 + horizon] - forecast_holt_batch(level, trend, phi, horizon)
+            fold_rmse[..., fold] = np.sqrt(np.mean(errors ** 2, axis=-1))
+            fold_mae[..., fold] = np.mean(np.abs(errors), axis=-1)
+            squared_sum += np.sum(errors ** 2, axis=-1)
+            absolute_sum += np.sum(np.abs(errors), axis=-1)
+            fold += 1
+    count = len(origins) * horizon
+    return {
+        'origins': origins,
+        'fold_rmse': fold_rmse,
+        'fold_mae': fold_mae,
+        'rmse': np.sqrt(squared_sum / count),
+        'mae': absolute_sum / count,
+    }
@@ -0,0 +1,75 @@
+import math
+import numpy as np
+from api.gold_forecaster import HoltMethod, find_daily_tuning, remember_daily_tuning, select_daily_model
+def _sequence(item, field):
+    values = item.get(field)
+    if values is None:
+        return []
+    if not isinstance(values, (list, tuple, np.ndarray)):
+        raise ValueError(f"'{field}' must be a list")
+    return values
+def _clean_values(item):
+    """Non-null values in date order, with their dates (None when the series has none)"""
+    raw = _sequence(item, 'values')
+    values = [float(v) for v in raw if v is not None and not math.isnan(float(v))]
+    dates = _sequence(item, 'dates')
+    if not len(dates):
+        return values, None
+    if len(dates) != len(raw):
+        raise ValueError("'dates' and 'values' must have the same length")
+    pairs = [(d, float(v)) for d, v in zip(dates, raw) if v is not None and not math.isnan(float(v))]
+    days = np.array([d for d, _ in pairs], dtype='datetime64[D]')
+    order = np.argsort(days, kind='stable')
+    return [pairs[i][1] for i in order], days[order]
+def _prepare(item, horizon, test_size):
+    """(values, horizon, dates) for one series, raising ValueError or TypeError when it cannot be forecast"""
+    values, dates = _clean_values(item)
+    item_horizon = int(item.get('horizon', horizon))
+    if item_horizon < 1:
+        raise ValueError("'horizon' must be at least 1")
+    if len(values) <= test_size:
+        raise ValueError(f"needs more than {test_size} non-null values, got {len(values)}")
+    return values, item_horizon, dates
+def _forecast_one(values, item_horizon, test_size, dates, tuning_cache):
+    """Select and forecast one series the way the daily /forecast model is; a result dict or an error string"""
+    import pandas as pd
+    index = pd.DatetimeIndex(dates) if dates is not None else pd.RangeIndex(len(values))
+    series = pd.Series(values, index=index, dtype=np.float64)
+    model, selection, warm_start = (find_daily_tuning(tuning_cache, series, test_size)
+                                    if tuning_cache is not None else (None, None, None))
+    if selection is None:
+        selection = select_daily_model(series.values[:-test_size], series.values[-test_size:], warm_start=warm_start)
+        if selection is None:
+            return "no finite candidate model"
+        model = HoltMethod(alpha=selection['alpha'], beta=selection['beta'], damped=selection['method'] == "Damped",
+                           phi=selection['phi'] if selection['phi'] != "N/A" else None, store_fitted=False)
+        model.fit(series.values)
+        if tuning_cache is not None:
+            remember_daily_tuning(tuning_cache, series, test_size, model, selection)
+    return {
+        'modelType': "Damped Holt's Method" if selection['method'] == "Damped" else "Regular Holt's Method",
+        'alpha': selection['alpha'],
+        'beta': selection['beta'],
+        'phi': selection['phi'],
+        'rmse': selection['rmse'],
+        'mae': selection['mae'],
+        'observations': len(values),
+        'forecast': model.forecast(steps=item_horizon).tolist(),
+    }
+def forecast_many(series, horizon=3, test_size=3, tuning_cache=None):
+    """Tune and forecast many series, yielding one result per series in input order.
+
+    Each item is {'name', 'values', optional 'dates' (ISO, used for ordering), optional 'horizon'}. Every
+    series goes through select_daily_model, so GOLD_SEARCH_STRATEGY, GOLD_BACKTEST_FOLDS and
+    GOLD_SEARCH_PRUNE_RATIO apply and a series gets the same model /forecast would give it. With a
+    `tuning_cache` an unchanged series reuses its memoized selection. Each result is yielded as soon as
+    its series is done; a series that cannot be forecast yields an 'error' line instead.
+    """
+    for position, item in enumerate(series):
+        name = item.get('name', str(position))
+        try:
+            values, item_horizon, dates = _prepare(item, horizon, test_size)
+            result = _forecast_one(values, item_horizon, test_size, dates, tuning_cache)
+        except (TypeError, ValueError) as e:
+            result = str(e)
+        yield {'name': name, 'error': result} if isinstance(result, str) else dict({'name': name}, **result)
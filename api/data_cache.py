@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+import time
+import uuid
+from api.metrics import get_metrics
+from api.process_local import ProcessLocal
+from api.single_flight import get_single_flight
+from api.sqlite_store import connect, prepare_path
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'gold_cache.sqlite3')
+class ScrapeCache:
+    """SQLite-backed cache for scraped data, shared by every process that points at the same file.
+
+    Entries younger than `ttl` seconds are served as-is. Older entries (up to `stale_ttl`)
+    are still served while a single background refresh runs; only one process holds the
+    refresh lease for a key at a time.
+    """
+    def __init__(self, path=None, ttl=None, stale_ttl=None, refresh_timeout=120):
+        self.path = path or os.environ.get('GOLD_CACHE_PATH', DEFAULT_CACHE_PATH)
+        self.ttl = float(ttl if ttl is not None else os.environ.get('GOLD_CACHE_TTL', 900))
+        self.stale_ttl = float(stale_ttl if stale_ttl is not None else os.environ.get('GOLD_CACHE_STALE_TTL', 86400))
+        self.refresh_timeout = refresh_timeout
+        self._owner = uuid.uuid4().hex
+        prepare_path(self.path)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, payload TEXT NOT NULL, fetched_at REAL NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)")
+    def _connect(self):
+        return connect(self.path)
+    def read(self, key):
+        """Return (value, fetched_at) for `key`, or (None, None) when absent"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload, fetched_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None, None
+        return json.loads(row[0]), row[1]
+    def write(self, key, value, fetched_at=None):
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO entries (key, payload, fetched_at) VALUES (?, ?, ?)",
+                         (key, json.dumps(value), fetched_at))
+    def _acquire_lease(self, key):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[1] > now:
+                conn.execute("COMMIT")
+                return False
+            conn.execute("INSERT OR REPLACE INTO leases (key, owner, expires_at) VALUES (?, ?, ?)",
+                         (key, self._owner, now + self.refresh_timeout))
+            conn.execute("COMMIT")
+        return True
+    def _release_lease(self, key):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self._owner))
+    def _refresh(self, key, fetch):
+        try:
+            value = fetch()
+            if value is not None:
+                self.write(key, value)
+            return value
+        finally:
+            self._release_lease(key)
+    def _refresh_in_background(self, key, fetch):
+        if not self._acquire_lease(key):
+            return
+        def run():
+            try:
+                self._refresh(key, fetch)
+            except Exception as e:
+                print(f"Background cache refresh failed for '{key}': {e}")
+        threading.Thread(target=run, name=f"cache-refresh-{key}", daemon=True).start()
+    def get(self, key, fetch, allow_stale=True):
+        """Return the cached value for `key`, calling `fetch()` when it is missing or expired.
+
+        `fetch` must return a JSON-serializable value, or None on failure (which is not cached).
+        Concurrent misses, in this or other processes, share a single fetch. With allow_stale=False
+        an expired entry is refetched synchronously rather than served while a background refresh
+        runs; it is only returned if that fetch fails.
+        """
+        value, fetched_at = self.read(key)
+        age = time.time() - fetched_at if fetched_at is not None else None
+        if age is not None and age < self.ttl:
+            get_metrics().inc('gold_cache_lookups_total', result='fresh')
+            return value
+        if allow_stale and age is not None and age < self.stale_ttl:
+            get_metrics().inc('gold_cache_lookups_total', result='stale')
+            print(f"Serving stale cached '{key}' ({age:.0f}s old) while refreshing")
+            self._refresh_in_background(key, fetch)
+            return value
+        get_metrics().inc('gold_cache_lookups_total', result='miss')
+        def refresh():
+            fresh = fetch()
+            if fresh is not None:
+                self.write(key, fresh)
+            return fresh
+        fresh = get_single_flight().do(f'scrape-{key}', refresh, max_age=self.ttl)
+        return fresh if fresh is not None else value
+_default_cache = ProcessLocal(ScrapeCache)
+def get_default_cache():
+    """Per-process cache configured from GOLD_CACHE_* environment variables"""
+    return _default_cache.get()
@@ -0,0 +1,168 @@
+import atexit
+import contextlib
+import functools
+import os
+import socket
+import sys
+import threading
+import time
+from api.metrics import get_metrics
+from api.process_local import ProcessLocal
+@functools.lru_cache(maxsize=None)
+def resolve_chromedriver_path():
+    """Resolve the ChromeDriver binary once per process; None means fall back to the one on PATH"""
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+        print(f"Resolved ChromeDriver via webdriver-manager: {path}")
+        return path
+    except Exception as e:
+        print(f"Error resolving ChromeDriver with webdriver-manager: {e}")
+        return None
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+def build_chrome_options(debug_port=None):
+    from selenium.webdriver.chrome.options import Options
+    chrome_options = Options()
+    chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-plugins")
+    chrome_options.add_argument("--disable-images")
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+    chrome_options.add_argument("--disable-features=TranslateUI")
+    chrome_options.add_argument("--disable-ipc-flooding-protection")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument("--aggressive-cache-discard")
+    chrome_options.page_load_strategy = 'none'
+    chrome_options.add_argument("--headless")
+    if sys.platform.startswith('linux'):
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument(f"--remote-debugging-port={debug_port or free_port()}")
+    return chrome_options
+def setup_chrome_driver(debug_port=None):
+    """Setup Chrome driver with cross-platform compatibility"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    chrome_options = build_chrome_options(debug_port)
+    driver_path = resolve_chromedriver_path()
+    if driver_path is not None:
+        try:
+            driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+            print("ChromeDriver initialized successfully using webdriver-manager")
+            return driver
+        except Exception as e:
+            print(f"Error setting up ChromeDriver with webdriver-manager: {e}")
+    try:
+        driver = webdriver.Chrome(options=chrome_options)
+        print("ChromeDriver initialized successfully from PATH")
+        return driver
+    except Exception as e2:
+        print(f"Error setting up ChromeDriver from PATH: {e2}")
+        print("Please ensure Chrome browser is installed and ChromeDriver is available")
+        raise
+class PooledDriver:
+    __slots__ = ('driver', 'debug_port', 'uses', 'created_at')
+    def __init__(self, driver, debug_port):
+        self.driver = driver
+        self.debug_port = debug_port
+        self.uses = 0
+        self.created_at = time.time()
+class DriverPool:
+    """Bounded pool of reusable WebDriver sessions, each with its own remote-debugging port.
+
+    Sessions are health-checked before being handed out and recycled after `max_uses` borrows.
+    """
+    def __init__(self, factory=setup_chrome_driver, size=None, max_uses=None, borrow_timeout=None):
+        self.factory = factory
+        self.size = int(size if size is not None else os.environ.get('GOLD_DRIVER_POOL_SIZE', 1))
+        self.max_uses = int(max_uses if max_uses is not None else os.environ.get('GOLD_DRIVER_MAX_USES', 50))
+        self.borrow_timeout = float(borrow_timeout if borrow_timeout is not None else os.environ.get('GOLD_DRIVER_BORROW_TIMEOUT', 60))
+        self._idle = []
+        self._created = 0
+        self._closed = False
+        self._condition = threading.Condition()
+    @staticmethod
+    def is_healthy(pooled):
+        try:
+            return pooled.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+    def _destroy(self, pooled):
+        try:
+            pooled.driver.quit()
+            print("Browser closed")
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+    def acquire(self):
+        deadline = time.monotonic() + self.borrow_timeout
+        while True:
+            with self._condition:
+                while not self._idle and self._created >= self.size:
+                    if self._closed:
+                        raise RuntimeError("Driver pool is closed")
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No browser session became available within {self.borrow_timeout}s")
+                    self._condition.wait(remaining)
+                pooled = self._idle.pop() if self._idle else None
+                if pooled is None:
+                    self._created += 1
+            if pooled is None:
+                port = free_port()
+                try:
+                    with get_metrics().stage('driver_start'):
+                        driver = self.factory(debug_port=port)
+                    return PooledDriver(driver, port)
+                except Exception:
+                    with self._condition:
+                        self._created -= 1
+                        self._condition.notify()
+                    raise
+            if self.is_healthy(pooled):
+                return pooled
+            print("Discarding unhealthy browser session")
+            self._discard(pooled)
+    def _discard(self, pooled):
+        self._destroy(pooled)
+        with self._condition:
+            self._created -= 1
+            self._condition.notify()
+    def release(self, pooled, discard=False):
+        pooled.uses += 1
+        if discard or self._closed or pooled.uses >= self.max_uses:
+            self._discard(pooled)
+            return
+        with self._condition:
+            self._idle.append(pooled)
+            self._condition.notify()
+    @contextlib.contextmanager
+    def driver(self):
+        """Borrow a driver; sessions that raise are discarded instead of returned to the pool"""
+        pooled = self.acquire()
+        try:
+            yield pooled.driver
+        except BaseException:
+            self.release(pooled, discard=True)
+            raise
+        else:
+            self.release(pooled)
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._condition.notify_all()
+        for pooled in idle:
+            self._destroy(pooled)
+_pool = ProcessLocal(DriverPool, on_create=lambda pool: atexit.register(pool.close))
+def get_driver_pool():
+    """Per-process driver pool configured from GOLD_DRIVER_* environment variables"""
+    return _pool.get()
@@ -1,209 +1,274 @@
-import pandas as pd
-import sys
+import hashlib
 import os
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+import time
 import numpy as np
-from statsmodels.tsa.holtwinters import Holt
-from sklearn.metrics import mean_squared_error, mean_absolute_error
+from api.backtest import backtest_folds, rolling_origin_backtest
+from api.data_cache import get_default_cache
+from api.driver_pool import setup_chrome_driver
+from api.holt_batch import evaluate_holt_batch, evaluate_holt_batch_parallel, holt_forecast, holt_residuals
+from api.ingest import float_records_column, parse_daily_dates, parse_months, parse_prices
+from api.intervals import forecast_interval, interval_level, interval_method
+from api.scrapers import scrape_tables
+from api.metrics import get_metrics
+from api.search import default_strategy, search_prune_ratio
+from api.tuning_cache import tuning_config, tuning_key, warm_start_enabled
 import warnings
 warnings.filterwarnings('ignore')
+RESIDUAL_WINDOW = 500
 class HoltMethod:
-    def __init__(self, alpha=0.3, beta=0.1, damped=False, phi=0.98):
+    __slots__ = ('alpha', 'beta', 'damped', 'phi', 'level', 'trend', 'nobs', 'store_fitted', 'fitted_values', 'residuals')
+    def __init__(self, alpha=0.3, beta=0.1, damped=False, phi=0.98, store_fitted=True):
         self.alpha = alpha
         self.beta = beta
         self.damped = damped
         self.phi = phi if damped else 1.0
         self.level = None
         self.trend = None
-        self.fitted_values = []
+        self.nobs = 0
+        self.store_fitted = store_fitted
+        self.fitted_values = None
+        self.residuals = np.empty(0, dtype=np.float64)
     def fit(self, data):
-        values = data.values if hasattr(data, 'values') else data
+        values = np.asarray(data.values if hasattr(data, 'values') else data, dtype=np.float64)
         n = len(values)
-        self.level = values[0]
-        if n > 1:
-            self.trend = values[1] - values[0]
-        else:
-            self.trend = 0
-        self.fitted_values = [self.level]
+        alpha, beta, phi = self.alpha, self.beta, self.phi
+        level = float(values[0])
+        trend = float(values[1] - values[0]) if n > 1 else 0.0
+        fitted = np.empty(n, dtype=np.float64) if self.store_fitted else None
+        if fitted is not None:
+            fitted[0] = level
+        observations = values.tolist()
+        errors = []
+        residuals_from = max(n - RESIDUAL_WINDOW, 2)
         for t in range(1, n):
-            prev_level = self.level
-            prev_trend = self.trend
-            self.level = self.alpha * values[t] + (1 - self.alpha) * (prev_level + self.phi * prev_trend)
-            self.trend = self.beta * (self.level - prev_level) + (1 - self.beta) * self.phi * prev_trend
-            self.fitted_values.append(self.level)
+            prev_level = level
+            one_step = prev_level + phi * trend
+            if t >= residuals_from:
+                errors.append(observations[t] - one_step)
+            level = alpha * observations[t] + (1 - alpha) * one_step
+            trend = beta * (level - prev_level) + (1 - beta) * phi * trend
+            if fitted is not None:
+                fitted[t] = level
+        self.level = level
+        self.trend = trend
+        self.nobs = n
+        self.fitted_values = fitted
+        self.residuals = np.array(errors, dtype=np.float64)
+        return self
+    def update(self, new_values):
+        """Advance the fitted state over observations that follow the ones already seen"""
+        values = np.asarray(new_values, dtype=np.float64)
+        alpha, beta, phi = self.alpha, self.beta, self.phi
+        level, trend = self.level, self.trend
+        fitted = np.empty(len(values), dtype=np.float64) if self.store_fitted else None
+        observations = values.tolist()
+        errors = np.empty(len(values), dtype=np.float64)
+        for t in range(len(values)):
+            prev_level = level
+            one_step = prev_level + phi * trend
+            errors[t] = observations[t] - one_step
+            level = alpha * observations[t] + (1 - alpha) * one_step
+            trend = beta * (level - prev_level) + (1 - beta) * phi * trend
+            if fitted is not None:
+                fitted[t] = level
+        self.level = level
+        self.trend = trend
+        self.nobs += len(values)
+        self.residuals = np.concatenate([self.residuals, errors])[-RESIDUAL_WINDOW:]
+        if fitted is not None:
+            self.fitted_values = fitted if self.fitted_values is None else np.concatenate([self.fitted_values, fitted])
         return self
+    def get_state(self):
+        return {'alpha': self.alpha, 'beta': self.beta, 'damped': self.damped, 'phi': self.phi,
+                'level': self.level, 'trend': self.trend, 'nobs': self.nobs, 'residuals': self.residuals.tolist()}
+    @classmethod
+    def from_state(cls, state, store_fitted=False):
+        model = cls(alpha=state['alpha'], beta=state['beta'], damped=state['damped'], phi=state['phi'], store_fitted=store_fitted)
+        model.level = state['level']
+        model.trend = state['trend']
+        model.nobs = state['nobs']
+        model.residuals = np.asarray(state.get('residuals', []), dtype=np.float64)
+        return model
     def forecast(self, steps):
-        forecasts = []
-        for h in range(1, steps + 1):
-            if self.damped:
-                phi_sum = sum([self.phi ** i for i in range(1, h + 1)])
-                forecast = self.level + phi_sum * self.trend
-            else:
-                forecast = self.level + h * self.trend
-            forecasts.append(forecast)
-        return np.array(forecasts)
-def setup_chrome_driver():
-    """Setup Chrome driver with cross-platform compatibility"""
-    chrome_options = Options()
-    chrome_options.add_argument("--start-maximized")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-plugins")
-    chrome_options.add_argument("--disable-images")
-    chrome_options.add_argument("--disable-background-timer-throttling")
-    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-    chrome_options.add_argument("--disable-renderer-backgrounding")
-    chrome_options.add_argument("--disable-features=TranslateUI")
-    chrome_options.add_argument("--disable-ipc-flooding-protection")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    chrome_options.add_argument("--aggressive-cache-discard")
-    chrome_options.page_load_strategy = 'none'
-    chrome_options.add_argument("--headless")
-    if sys.platform.startswith('linux'):
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--remote-debugging-port=9222")
-    try:
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        print("ChromeDriver initialized successfully using webdriver-manager")
-        return driver
-    except Exception as e:
-        print(f"Error setting up ChromeDriver with webdriver-manager: {e}")
-        try:
-            driver = webdriver.Chrome(options=chrome_options)
-            print("ChromeDriver initialized successfully from PATH")
-            return driver
-        except Exception as e2:
-            print(f"Error setting up ChromeDriver from PATH: {e2}")
-            print("Please ensure Chrome browser is installed and ChromeDriver is available")
-            raise
-def scrape_gold_data():
+        h = np.arange(1, steps + 1, dtype=np.float64)
+        if self.damped and self.phi != 1.0:
+            phi_sum = self.phi * (1 - self.phi ** h) / (1 - self.phi)
+        else:
+            phi_sum = h
+        return self.level + phi_sum * self.trend
+def scrape_gold_data(backends=None):
     """Main function to scrape gold price data"""
-    driver = setup_chrome_driver()
-    driver.set_page_load_timeout(10)
-    driver_wait = WebDriverWait(driver, 3)
     try:
-        print("Loading Economic Times gold price page...")
-        driver.get("https://economictimes.indiatimes.com/markets/gold-rate-in-india-today")
-        driver_wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-        section_24k = driver.find_element(By.ID, "monthTrend24c")
-        driver.execute_script("arguments[0].scrollIntoView(true);", section_24k)
-        print("Extracting data from tables...")
-        tables_data = driver.execute_script("""
-            var dailyTable = document.querySelector('table.table.lg_txt.rf_rr');
-            var monthlyTable = document.querySelector('#monthTrend24c table');
-            var dailyRows = Array.from(dailyTable.querySelectorAll('tr')).slice(1);
-            var monthlyRows = Array.from(monthlyTable.querySelectorAll('tbody tr'));
-            var dailyData = dailyRows.map(row => {
-                var cells = row.querySelectorAll('td');
-                if (cells.length >= 3) {
-                    return {
-                        date: cells[0].textContent.trim(),
-                        price: cells[2].querySelector('.text').textContent.trim()
-                    };
-                }
-                return null;
-            }).filter(item => item !== null);   
-            var monthlyData = monthlyRows.map(row => {
-                var cells = row.querySelectorAll('td');
-                if (cells.length >= 6) {
-                    return {
-                        month: cells[0].textContent.trim(),
-                        start: cells[1].textContent.trim(),
-                        end: cells[2].textContent.trim(),
-                        change: cells[3].querySelector('span') ? cells[3].querySelector('span').textContent.trim() : cells[3].textContent.trim(),
-                        percent: cells[4].querySelector('span') ? cells[4].querySelector('span').textContent.trim() : cells[4].textContent.trim(),
-                        average: cells[5].textContent.trim()
-                    };
-                }
-                return null;
-            }).filter(item => item !== null);
-            return {daily: dailyData, monthly: monthlyData};
-        """)
-        print("Processing daily data...")
-        daily_data = []
-        for item in tables_data['daily']:
-            date_text = item['date']
-            raw_price = item['price']
-            numeric_str = raw_price.replace('₹', '').replace(',', '')
-            try:
-                price_value = float(numeric_str) / 10  
-            except ValueError:
-                price_value = None
-            daily_data.append({
-                'Date': date_text,
-                'Price_per_gram': price_value
-            })
-        print("Processing monthly data...")
-        monthly_data = []
-        for item in tables_data['monthly']:
-            month = item['month']
-            start_price = item['start'].replace('₹', '').replace(',', '')
-            end_price = item['end'].replace('₹', '').replace(',', '')
-            change_value = item['change']
-            percent_change = item['percent']
-            average_price = item['average'].replace('₹', '').replace(',', '')  
-            try:
-                start_val = float(start_price)
-                end_val = float(end_price)
-                avg_val = float(average_price)
-            except ValueError:
-                start_val = end_val = avg_val = None     
-            monthly_data.append({
-                'Month': month,
+        tables_data = scrape_tables(backends)
+        with get_metrics().stage('parse_rows'):
+            print("Processing daily data...")
+            daily_rows = tables_data['daily']
+            daily_prices = float_records_column(parse_prices([item['price'] for item in daily_rows]) / 10)
+            daily_data = [{'Date': item['date'], 'Price_per_gram': price} for item, price in zip(daily_rows, daily_prices)]
+            print("Processing monthly data...")
+            monthly_rows = tables_data['monthly']
+            prices = np.vstack([parse_prices([item[field] for item in monthly_rows]) for field in ('start', 'end', 'average')])
+            prices[:, np.isnan(prices).any(axis=0)] = np.nan
+            start_values, end_values, average_values = (float_records_column(column) for column in prices)
+            monthly_data = [{
+                'Month': item['month'],
                 'Start_per_gram': start_val,
                 'End_per_gram': end_val,
-                'Change_Rs': change_value,
-                'Percent_change': percent_change,
+                'Change_Rs': item['change'],
+                'Percent_change': item['percent'],
                 'Average_per_gram': avg_val
-            })
+            } for item, start_val, end_val, avg_val in zip(monthly_rows, start_values, end_values, average_values)]
         print("Scraping completed successfully!")
         return daily_data, monthly_data 
     except Exception as e:
         print(f"Error during scraping: {e}")
         return None, None 
-    finally:
-        if driver:
-            driver.quit()
-            print("Browser closed") 
-def process_and_forecast(daily_data, monthly_data):
-    """Processes scraped data and generates gold price forecasts."""
-    if not daily_data or not monthly_data:
-        print("No data received for processing.")
+def cached_scrape_gold_data(cache=None, backends=None, allow_stale=True):
+    """Return (daily_data, monthly_data) from the scrape cache, scraping only when it has expired.
+
+    allow_stale=False waits for a fresh scrape instead of returning an expired one (see ScrapeCache.get).
+    """
+    def fetch():
+        daily_data, monthly_data = scrape_gold_data(backends)
+        if daily_data is None or monthly_data is None:
+            return None
+        return {'daily': daily_data, 'monthly': monthly_data}
+    cached = (cache or get_default_cache()).get('economictimes', fetch, allow_stale=allow_stale)
+    if cached is None:
+        return None, None
+    return cached['daily'], cached['monthly']
+DAILY_ALPHA_VALUES = [0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.99, 0.995]
+DAILY_BETA_VALUES = [0.05, 0.1, 0.15, 0.2, 0.25, 0.284, 0.3, 0.35, 0.4, 0.45, 0.5]
+DAILY_PHI_VALUES = [0.8, 0.85, 0.9, 0.95, 0.98, 0.99]
+def select_daily_model(train_values, test_values, alpha_values=DAILY_ALPHA_VALUES, beta_values=DAILY_BETA_VALUES, phi_values=DAILY_PHI_VALUES, workers=None, folds=None,
+                       strategy=None, prune_ratio=None, warm_start=None):
+    """Search regular and damped Holt on a holdout split; returns the winning method, parameters and metrics.
+
+    With folds > 1 (default GOLD_BACKTEST_FOLDS) candidates are scored on that many rolling origins of
+    len(test_values) steps each, ending at the same holdout, and the pooled RMSE/MAE are reported.
+    `strategy` defaults to GOLD_SEARCH_STRATEGY and `prune_ratio` (single holdout only) to GOLD_SEARCH_PRUNE_RATIO.
+    `warm_start` is a previous selection to start both searches around (the damped one at the largest
+    phi when it was regular); a search that finds nothing from there is rerun from scratch.
+    """
+    folds = folds or backtest_folds()
+    strategy = strategy or default_strategy()
+    prune_ratio = prune_ratio if prune_ratio is not None else search_prune_ratio()
+    def score(alpha, beta, phi):
+        if folds > 1:
+            backtest = rolling_origin_backtest(np.concatenate([train_values, test_values]), alpha, beta, phi,
+                                               folds=folds, horizon=len(test_values))
+            return backtest['rmse'], backtest['mae'], np.ones(len(alpha), dtype=bool)
+        return evaluate_holt_batch_parallel(train_values, test_values, alpha, beta, phi, workers=workers, prune_ratio=prune_ratio)
+    def search(start, *values):
+        result = strategy.search(score, *values, start=start) if start is not None else None
+        return result if result is not None else strategy.search(score, *values)
+    regular_start = damped_start = None
+    if warm_start is not None:
+        regular_start = (warm_start['alpha'], warm_start['beta'])
+        damped_start = regular_start + (warm_start['phi'] if warm_start['phi'] != "N/A" else max(phi_values),)
+    print(f"Searching for best daily Regular Holt model using {strategy.name} search...")
+    with get_metrics().stage('search_regular'):
+        regular = search(regular_start, alpha_values, beta_values)
+    print(f"Searching for best daily Damped Holt model using {strategy.name} search...")
+    with get_metrics().stage('search_damped'):
+        damped = search(damped_start, alpha_values, beta_values, phi_values)
+    print("Selecting best overall daily model...")
+    if regular is not None and (damped is None or regular['rmse'] < damped['rmse']):
+        return {'method': "Regular", 'rmse': regular['rmse'], 'mae': regular['mae'],
+                'alpha': regular['alpha'], 'beta': regular['beta'], 'phi': "N/A"}
+    if damped is not None:
+        return {'method': "Damped", 'rmse': damped['rmse'], 'mae': damped['mae'],
+                'alpha': damped['alpha'], 'beta': damped['beta'], 'phi': damped['phi']}
+    return None
+def series_fingerprint(series):
+    return hashlib.sha1(series.index.values.astype('datetime64[ns]').tobytes() + np.ascontiguousarray(series.values, dtype=np.float64).tobytes()).hexdigest()
+def resume_daily_model(state_store, daily_series, retune_interval=None):
+    """Advance the saved daily model over observations added since it was fitted.
+
+    Returns (model, selection), or None when there is no usable state: it is older than the
+    re-tuning interval, or the already-consumed part of the series has changed.
+    """
+    import pandas as pd
+    retune_interval = float(retune_interval if retune_interval is not None else os.environ.get('GOLD_RETUNE_INTERVAL', 86400))
+    saved = state_store.load('daily')
+    if saved is None or time.time() - saved['tuned_at'] >= retune_interval:
         return None
+    last_date = pd.Timestamp(saved['last_date'])
+    consumed = daily_series[daily_series.index <= last_date]
+    if len(consumed) != saved['nobs'] or consumed.index[-1] != last_date or series_fingerprint(consumed) != saved['fingerprint']:
+        return None
+    model = HoltMethod.from_state(saved['model'])
+    model.update(daily_series[daily_series.index > last_date].values)
+    return model, saved['selection']
+def save_daily_model(state_store, model, selection, daily_series, resumed=False):
+    """Persist the fitted daily model; `tuned_at` carries over from the saved state when resumed, else from a memoized selection"""
+    saved = state_store.load('daily') if resumed else None
+    state_store.save('daily', {
+        'model': model.get_state(),
+        'selection': dict(selection, nobs=model.nobs),
+        'nobs': model.nobs,
+        'last_date': daily_series.index[-1].isoformat(),
+        'fingerprint': series_fingerprint(daily_series),
+        'tuned_at': saved['tuned_at'] if saved is not None else selection.get('tuned_at', time.time()),
+    })
+WARM_START_TAIL = 30
+def daily_tuning_config(test_size):
+    return tuning_config(DAILY_ALPHA_VALUES, DAILY_BETA_VALUES, DAILY_PHI_VALUES, test_size, default_strategy(),
+                         backtest_folds(), search_prune_ratio())
+def find_daily_tuning(tuning_cache, daily_series, test_size):
+    """Memoized daily model for this exact series and search configuration.
+
+    Returns (model, selection, None) on a hit, with the time the entry was tuned as selection['tuned_at']. On a miss returns (None, None, warm_start): the last
+    selection under the same configuration when the series has only changed in its last
+    WARM_START_TAIL rows since (new days or revised recent prices), otherwise None.
+    """
+    config = daily_tuning_config(test_size)
+    cached = tuning_cache.get(tuning_key(config, series_fingerprint(daily_series)))
+    if cached is not None:
+        return HoltMethod.from_state(cached['model']), dict(cached['selection'], tuned_at=cached.get('tuned_at', time.time())), None
+    hint = tuning_cache.hint(config) if warm_start_enabled() else None
+    if hint is None or len(daily_series) < hint['head_nobs'] or series_fingerprint(daily_series.iloc[:hint['head_nobs']]) != hint['head']:
+        return None, None, None
+    return None, None, hint['selection']
+def remember_daily_tuning(tuning_cache, daily_series, test_size, model, selection):
+    config = daily_tuning_config(test_size)
+    head_nobs = max(len(daily_series) - WARM_START_TAIL, 0)
+    tuning_cache.put(tuning_key(config, series_fingerprint(daily_series)), {'selection': selection, 'model': model.get_state(), 'tuned_at': time.time()},
+                     config=config, hint={'selection': selection, 'head_nobs': head_nobs,
+                                          'head': series_fingerprint(daily_series.iloc[:head_nobs])})
+def build_frames(daily_data, monthly_data):
+    """Date-indexed, sorted daily and monthly DataFrames from scraped records"""
+    import pandas as pd
     daily_df = pd.DataFrame(daily_data)
     monthly_df = pd.DataFrame(monthly_data)
     if not daily_df.empty:
-        daily_df['Date'] = pd.to_datetime(daily_df['Date'], format='%b %d, %Y')
+        daily_df['Date'] = parse_daily_dates(daily_df['Date'].tolist())
         daily_df.set_index('Date', inplace=True)
         daily_df.sort_index(inplace=True)
-    monthly_series = None
     if not monthly_df.empty:
-        actual_months = []
-        for month_str in monthly_df['Month']:
-            month_parts = month_str.split()
-            month_name = month_parts[0]
-            year = int('20' + month_parts[1])
-            month_dict = {
-                'January': 1, 'February': 2, 'March': 3, 'April': 4,
-                'May': 5, 'June': 6, 'July': 7, 'August': 8,
-                'September': 9, 'October': 10, 'November': 11, 'December': 12
-            }
-            month_num = month_dict[month_name]
-            actual_months.append(pd.Timestamp(year=year, month=month_num, day=1))
-        monthly_df['Date'] = actual_months
+        monthly_df['Date'] = parse_months(monthly_df['Month'].tolist())
         monthly_df.set_index('Date', inplace=True)
         monthly_df.sort_index(inplace=True)
-        monthly_series = monthly_df['Average_per_gram']
+    return daily_df, monthly_df
+def process_and_forecast(daily_data, monthly_data, state_store=None, daily_horizon=3, monthly_horizon=3, tuning_cache=None):
+    """Processes scraped data and generates gold price forecasts."""
+    if not daily_data or not monthly_data:
+        print("No data received for processing.")
+        return None
+    with get_metrics().stage('build_frames'):
+        daily_df, monthly_df = build_frames(daily_data, monthly_data)
+    return forecast_frames(daily_df, monthly_df, state_store, daily_horizon, monthly_horizon, tuning_cache=tuning_cache)
+def forecast_frames(daily_df, monthly_df, state_store=None, daily_horizon=3, monthly_horizon=3, include_data=True, tuning_cache=None,
+                    data_rows=None):
+    """Tune and forecast frames shaped like build_frames' output; include_data=False leaves the input rows out of the result.
+
+    `data_rows` is an optional (daily, monthly) count of the most recent rows to return, so a forecast
+    fitted on the full history still returns only the window that was scraped.
+
+    With a `tuning_cache` (api.tuning_cache.TuningCache) an unchanged daily series reuses its memoized
+    selection and fitted state, and one that changed only at the tail starts its search near the last optimum.
+    """
+    monthly_series = monthly_df['Average_per_gram'] if not monthly_df.empty else None
     monthly_forecast = None
     monthly_rmse = None
     monthly_mae = None
@@ -211,40 +276,29 @@ def process_and_forecast(daily_data, monthly_data):
     monthly_alpha = "N/A"
     monthly_beta = "N/A"
     monthly_phi = "N/A"
+    monthly_interval = None
     print("Starting monthly model evaluation...")
     if monthly_series is not None and len(monthly_series) > 3:
         test_size_monthly = 3
         if len(monthly_series) >= test_size_monthly:
             train_series_monthly = monthly_series.iloc[:-test_size_monthly]
             test_series_monthly = monthly_series.iloc[-test_size_monthly:]
-            def evaluate_holt_model_monthly(train_data, test_data, alpha, beta, phi=None, damped=False):
-                try:
-                    if damped:
-                        model = Holt(train_data, exponential=False, damped_trend=True)
-                        fitted = model.fit(smoothing_level=alpha, smoothing_trend=beta, damping_trend=phi, optimized=False)
-                    else:
-                        model = Holt(train_data, exponential=False)
-                        fitted = model.fit(smoothing_level=alpha, smoothing_trend=beta, optimized=False)
-                    predictions = fitted.forecast(steps=len(test_data))
-                    rmse = np.sqrt(mean_squared_error(test_data, predictions))
-                    mae = mean_absolute_error(test_data, predictions)
-                    return rmse, mae, fitted
-                except Exception as e:
-                    print(f"Error evaluating Holt model: {e}")
-                    return float('inf'), float('inf'), None 
             eval_alpha_m = 0.9
             eval_beta_m = 0.1
             eval_phi_m = 0.8
             eval_damped_m = True
-            rmse_result_m, mae_result_m, fitted_model_m = evaluate_holt_model_monthly(
-                train_series_monthly,
-                test_series_monthly,
-                eval_alpha_m,
-                eval_beta_m,
-                phi=eval_phi_m,
-                damped=eval_damped_m
+            rmse_m, mae_m, _ = evaluate_holt_batch(
+                train_series_monthly.values,
+                test_series_monthly.values,
+                [eval_alpha_m],
+                [eval_beta_m],
+                [eval_phi_m if eval_damped_m else 1.0],
+                start=0
             )
-            if fitted_model_m is not None:
+            fitted_model_m = np.isfinite(rmse_m[0])
+            rmse_result_m = float(rmse_m[0])
+            mae_result_m = float(mae_m[0])
+            if fitted_model_m:
                 monthly_rmse = rmse_result_m
                 monthly_mae = mae_result_m
                 monthly_model_type = "Damped Holt's Method" if eval_damped_m else "Holt's Method"
@@ -253,26 +307,29 @@ def process_and_forecast(daily_data, monthly_data):
                 monthly_phi = eval_phi_m if eval_damped_m else "N/A"
                 print("Fitting monthly model on full data and forecasting...")
                 try:
-                     if eval_damped_m:
-                         full_model_m = Holt(monthly_series, exponential=False, damped_trend=True)
-                         full_fitted_m = full_model_m.fit(
-                             smoothing_level=monthly_alpha,
-                             smoothing_trend=monthly_beta,
-                             damping_trend=monthly_phi if monthly_phi != "N/A" else None,
-                             optimized=False
-                         )
-                     else:
-                         full_model_m = Holt(monthly_series, exponential=False)
-                         full_fitted_m = full_model_m.fit(
-                             smoothing_level=monthly_alpha,
-                             smoothing_trend=monthly_beta,
-                             optimized=False
-                         )
-                     monthly_forecast = full_fitted_m.forecast(steps=3)
-                     print(f"Monthly forecast calculated: {monthly_forecast.tolist()}")
+                    with get_metrics().stage('monthly_fit'):
+                        monthly_forecast = holt_forecast(
+                            monthly_series.values,
+                            monthly_alpha,
+                            monthly_beta,
+                            phi=monthly_phi if monthly_phi != "N/A" else 1.0,
+                            steps=monthly_horizon,
+                            start=0
+                        )
+                        print(f"Monthly forecast calculated: {monthly_forecast.tolist()}")
+                    with get_metrics().stage('intervals'):
+                        monthly_interval = forecast_interval(
+                            monthly_forecast,
+                            holt_residuals(monthly_series.values, monthly_alpha, monthly_beta,
+                                           phi=monthly_phi if monthly_phi != "N/A" else 1.0, start=0),
+                            monthly_alpha,
+                            monthly_beta,
+                            phi=monthly_phi if monthly_phi != "N/A" else 1.0
+                        )
                 except Exception as e:
                     print(f"Error fitting full Monthly Holt model or forecasting: {e}")
                     monthly_forecast = None
+                    monthly_interval = None
             else:
                  print("Monthly model evaluation failed, cannot perform forecast or set RMSE/MAE.")
     daily_rmse = None
@@ -282,6 +339,7 @@ def process_and_forecast(daily_data, monthly_data):
     daily_beta = "N/A"
     daily_phi = "N/A" 
     daily_forecast = None
+    daily_interval = None
     print("Starting daily model evaluation...")
     if not daily_df.empty and len(daily_df) > 3: 
         test_size_daily = 3
@@ -290,92 +348,53 @@ def process_and_forecast(daily_data, monthly_data):
             if len(daily_series) >= test_size_daily:
                  train_series_daily = daily_series[:-test_size_daily]
                  test_series_daily = daily_series[-test_size_daily:]
-                 alpha_values_d = [0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.99, 0.995]
-                 beta_values_d = [0.05, 0.1, 0.15, 0.2, 0.25, 0.284, 0.3, 0.35, 0.4, 0.45, 0.5]
-                 phi_values_d = [0.8, 0.85, 0.9, 0.95, 0.98, 0.99]
-                 best_rmse_regular_d = float('inf')
-                 best_params_regular_d = None
-                 best_model_regular_d = None
-                 best_rmse_damped_d = float('inf')
-                 best_params_damped_d = None
-                 best_model_damped_d = None
-                 def evaluate_holt_model_daily(train_data, test_data, alpha, beta, phi=None, damped=False):
-                     try:
-                         if damped:
-                             model = HoltMethod(alpha=alpha, beta=beta, damped=True, phi=phi)
-                         else:
-                             model = HoltMethod(alpha=alpha, beta=beta, damped=False)
-                         model.fit(train_data.values) 
-                         predictions = model.forecast(len(test_data))
-                         rmse = np.sqrt(mean_squared_error(test_data.values, predictions)) 
-                         mae = mean_absolute_error(test_data.values, predictions) 
-                         return rmse, mae, model
-                     except Exception as e:
-                         print(f"Error evaluating custom HoltMethod model: {e}")
-                         return float('inf'), float('inf'), None
-                 print("Searching for best daily Regular Holt model using custom method...")
-                 for alpha in alpha_values_d:
-                     for beta in beta_values_d:
-                         rmse, mae, model = evaluate_holt_model_daily(train_series_daily, test_series_daily, alpha, beta, damped=False)
-                         if model is not None and rmse < best_rmse_regular_d:
-                             best_rmse_regular_d = rmse
-                             best_params_regular_d = (alpha, beta)
-                             best_model_regular_d = model
-                             best_mae_regular_d = mae
-                 print("Searching for best daily Damped Holt model using custom method...")
-                 for alpha in alpha_values_d:
-                     for beta in beta_values_d:
-                         for phi in phi_values_d:
-                             rmse, mae, model = evaluate_holt_model_daily(train_series_daily, test_series_daily, alpha, beta, phi=phi, damped=True)
-                             if model is not None and rmse < best_rmse_damped_d:
-                                 best_rmse_damped_d = rmse
-                                 best_params_damped_d = (alpha, beta, phi)
-                                 best_model_damped_d = model
-                                 best_mae_damped_d = mae
-                 print("Selecting best overall daily model...")
-                 best_model_d = None
-                 if best_rmse_regular_d < best_rmse_damped_d:
-                     best_method_d = "Regular"
-                     daily_rmse = best_rmse_regular_d
-                     daily_mae = best_mae_regular_d
-                     best_params_d = best_params_regular_d
-                     best_model_d = best_model_regular_d
-                     daily_model_type = "Regular Holt's Method"
-                     daily_alpha = best_params_d[0]
-                     daily_beta = best_params_d[1]
-                     daily_phi = "N/A"
+                 resumed_d = resume_daily_model(state_store, daily_series) if state_store is not None else None
+                 if resumed_d is not None:
+                     full_model_d, selection_d = resumed_d
+                     source_d = 'resumed'
+                     print(f"Advanced saved daily model state by {full_model_d.nobs - selection_d['nobs']} new observations")
                  else:
-                     best_method_d = "Damped"
-                     daily_rmse = best_rmse_damped_d
-                     daily_mae = best_mae_damped_d
-                     best_params_d = best_params_damped_d
-                     best_model_d = best_model_damped_d
-                     daily_model_type = "Damped Holt's Method"
-                     daily_alpha = best_params_d[0]
-                     daily_beta = best_params_d[1]
-                     daily_phi = best_params_d[2]
-                 if best_model_d is not None:
+                     full_model_d, selection_d, warm_start_d = (find_daily_tuning(tuning_cache, daily_series, test_size_daily)
+                                                                if tuning_cache is not None else (None, None, None))
+                     if selection_d is not None:
+                         source_d = 'cached'
+                         print("Reusing memoized daily model for an unchanged series")
+                     else:
+                         source_d = 'warm_started' if warm_start_d is not None and default_strategy().uses_start else 'retuned'
+                         selection_d = select_daily_model(train_series_daily.values, test_series_daily.values, warm_start=warm_start_d)
+                 get_metrics().inc('gold_daily_model_total', result=source_d)
+                 if selection_d is not None:
+                      daily_rmse = selection_d['rmse']
+                      daily_mae = selection_d['mae']
+                      daily_model_type = "Damped Holt's Method" if selection_d['method'] == "Damped" else "Regular Holt's Method"
+                      daily_alpha = selection_d['alpha']
+                      daily_beta = selection_d['beta']
+                      daily_phi = selection_d['phi']
                       print(f"Using best daily model ({daily_model_type}) with parameters Alpha: {daily_alpha}, Beta: {daily_beta}, Phi: {daily_phi} for final forecast...")
                       try:
-                          if best_method_d == "Damped":
-                               full_model_d = HoltMethod(
-                                    alpha=daily_alpha,
-                                    beta=daily_beta,
-                                    damped=True,
-                                    phi=daily_phi if daily_phi != "N/A" else None
-                               )
-                          else:
-                               full_model_d = HoltMethod(
-                                    alpha=daily_alpha,
-                                    beta=daily_beta,
-                                    damped=False
-                               )
-                          full_model_d.fit(daily_series.values) 
-                          daily_forecast = full_model_d.forecast(steps=3)
+                          if full_model_d is None:
+                              with get_metrics().stage('final_fit'):
+                                  full_model_d = HoltMethod(
+                                       alpha=daily_alpha,
+                                       beta=daily_beta,
+                                       damped=selection_d['method'] == "Damped",
+                                       phi=daily_phi if daily_phi != "N/A" else None,
+                                       store_fitted=False
+                                  )
+                                  full_model_d.fit(daily_series.values)
+                              if tuning_cache is not None:
+                                  remember_daily_tuning(tuning_cache, daily_series, test_size_daily, full_model_d, selection_d)
+                          if state_store is not None:
+                              save_daily_model(state_store, full_model_d, selection_d, daily_series, resumed=resumed_d is not None)
+                          daily_forecast = full_model_d.forecast(steps=daily_horizon)
                           print(f"Daily forecast calculated: {daily_forecast.tolist()}")
+                          with get_metrics().stage('intervals'):
+                              daily_interval = forecast_interval(daily_forecast, full_model_d.residuals, full_model_d.alpha,
+                                                                 full_model_d.beta, full_model_d.phi)
                       except Exception as e:
                           print(f"Error fitting full Daily Holt model or forecasting: {e}")
                           daily_forecast = None
+                          daily_interval = None
                  else:
                      print("No best daily model found, cannot perform forecast.")
 
@@ -383,31 +402,40 @@ def process_and_forecast(daily_data, monthly_data):
                  print(f"Insufficient non-null daily data ({len(daily_series)} points) for test split ({test_size_daily}).")
         else:
             print(f"Insufficient total daily data ({len(daily_df)} points) for test split ({test_size_daily}).")
-    results = {
-        "daily_data": daily_df.reset_index().to_dict(orient='records') if not daily_df.empty else [],
-        "monthly_data": [
-            {
-                'Month': item['Date'].strftime('%b %y'), 
-                'Start_per_gram': item['Start_per_gram'],
-                'End_per_gram': item['End_per_gram'],
-                'Change_Rs': item['Change_Rs'],
-                'Percent_change': item['Percent_change'],
-                'Average_per_gram': item['Average_per_gram']
-            } for item in monthly_df.reset_index().to_dict(orient='records')
-        ] if not monthly_df.empty else [],
-        "monthly_forecast": monthly_forecast.tolist() if monthly_forecast is not None else [],
-        "monthly_rmse": monthly_rmse if monthly_rmse is not None else "N/A",
-        "monthly_mae": monthly_mae if monthly_mae is not None else "N/A",
-        "monthly_modelType": monthly_model_type,
-        "monthly_alpha": monthly_alpha,
-        "monthly_beta": monthly_beta,
-        "monthly_phi": monthly_phi,
-        "daily_forecast": daily_forecast.tolist() if daily_forecast is not None else [], 
-        "daily_rmse": daily_rmse if daily_rmse is not None else "N/A",
-        "daily_mae": daily_mae if daily_mae is not None else "N/A",
-        "daily_modelType": daily_model_type,
-        "daily_alpha": daily_alpha,
-        "daily_beta": daily_beta,
-        "daily_phi": daily_phi,
-    }
+    with get_metrics().stage('serialize'):
+        if data_rows is not None:
+            daily_df, monthly_df = daily_df.tail(data_rows[0]), monthly_df.tail(data_rows[1])
+        results = {
+            "daily_data": daily_df.reset_index().to_dict(orient='records') if include_data and not daily_df.empty else [],
+            "monthly_data": [
+                {
+                    'Month': item['Date'].strftime('%b %y'), 
+                    'Start_per_gram': item['Start_per_gram'],
+                    'End_per_gram': item['End_per_gram'],
+                    'Change_Rs': item['Change_Rs'],
+                    'Percent_change': item['Percent_change'],
+                    'Average_per_gram': item['Average_per_gram']
+                } for item in monthly_df.reset_index().to_dict(orient='records')
+            ] if include_data and not monthly_df.empty else [],
+            "monthly_forecast": monthly_forecast.tolist() if monthly_forecast is not None else [],
+            "monthly_rmse": monthly_rmse if monthly_rmse is not None else "N/A",
+            "monthly_mae": monthly_mae if monthly_mae is not None else "N/A",
+            "monthly_modelType": monthly_model_type,
+            "monthly_alpha": monthly_alpha,
+            "monthly_beta": monthly_beta,
+            "monthly_phi": monthly_phi,
+            "daily_forecast": daily_forecast.tolist() if daily_forecast is not None else [], 
+            "daily_rmse": daily_rmse if daily_rmse is not None else "N/A",
+            "daily_mae": daily_mae if daily_mae is not None else "N/A",
+            "daily_modelType": daily_model_type,
+            "daily_alpha": daily_alpha,
+            "daily_beta": daily_beta,
+            "daily_phi": daily_phi,
+            "daily_forecast_lower": daily_interval[0].tolist() if daily_interval is not None else [],
+            "daily_forecast_upper": daily_interval[1].tolist() if daily_interval is not None else [],
+            "monthly_forecast_lower": monthly_interval[0].tolist() if monthly_interval is not None else [],
+            "monthly_forecast_upper": monthly_interval[1].tolist() if monthly_interval is not None else [],
+            "interval_level": interval_level(),
+            "interval_method": interval_method(),
+        }
     return results
\ No newline at end of file
@@ -0,0 +1,120 @@
+import datetime
+import os
+import threading
+import numpy as np
+from api.ingest import parse_daily_dates
+from api.process_local import ProcessLocal
+from api.sqlite_store import connect, prepare_path
+DEFAULT_HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'gold_history.sqlite3')
+MONTHLY_FIELDS = ('Start_per_gram', 'End_per_gram', 'Change_Rs', 'Percent_change', 'Average_per_gram')
+def _daily_keys(daily_data):
+    return np.datetime_as_string(parse_daily_dates([item['Date'] for item in daily_data]), unit='D').tolist()
+def _monthly_key(month_text):
+    return datetime.datetime.strptime(month_text, '%B %y').date().replace(day=1).isoformat()
+class PriceHistoryStore:
+    """Append-only SQLite history of scraped prices keyed on day (daily) and month (monthly).
+
+    Each merge only writes rows that are new or whose values changed. The full daily series is
+    kept in memory as NumPy arrays and patched with each delta, so reads do not touch the disk
+    unless another process has written since.
+    """
+    def __init__(self, path=None):
+        self.path = prepare_path(path or os.environ.get('GOLD_HISTORY_PATH', DEFAULT_HISTORY_PATH))
+        self._lock = threading.Lock()
+        self._dates = None
+        self._prices = None
+        self._generation = None
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS daily_prices (date TEXT PRIMARY KEY, price_per_gram REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS monthly_prices (month TEXT PRIMARY KEY, start_per_gram REAL, end_per_gram REAL, "
+                         "change_rs TEXT, percent_change TEXT, average_per_gram REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)")
+    def _connect(self):
+        return connect(self.path)
+    @staticmethod
+    def _read_generation(conn):
+        return conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+    def merge(self, daily_data, monthly_data):
+        """Upsert scraped records, returning the number of (daily, monthly) rows that were new or changed"""
+        daily_data = daily_data or []
+        daily_rows = [(key, item['Price_per_gram']) for key, item in zip(_daily_keys(daily_data), daily_data)]
+        monthly_rows = [(_monthly_key(item['Month']),) + tuple(item.get(field) for field in MONTHLY_FIELDS)
+                        for item in monthly_data or []]
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            generation = self._read_generation(conn)
+            before = conn.total_changes
+            conn.executemany("INSERT INTO daily_prices (date, price_per_gram) VALUES (?, ?) "
+                             "ON CONFLICT(date) DO UPDATE SET price_per_gram = excluded.price_per_gram "
+                             "WHERE price_per_gram IS NOT excluded.price_per_gram", daily_rows)
+            daily_changed = conn.total_changes - before
+            before = conn.total_changes
+            conn.executemany("INSERT INTO monthly_prices (month, start_per_gram, end_per_gram, change_rs, percent_change, average_per_gram) "
+                             "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(month) DO UPDATE SET "
+                             "start_per_gram = excluded.start_per_gram, end_per_gram = excluded.end_per_gram, "
+                             "change_rs = excluded.change_rs, percent_change = excluded.percent_change, "
+                             "average_per_gram = excluded.average_per_gram "
+                             "WHERE (start_per_gram, end_per_gram, change_rs, percent_change, average_per_gram) IS NOT "
+                             "(excluded.start_per_gram, excluded.end_per_gram, excluded.change_rs, excluded.percent_change, excluded.average_per_gram)",
+                             monthly_rows)
+            monthly_changed = conn.total_changes - before
+            if daily_changed or monthly_changed:
+                conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+            conn.execute("COMMIT")
+            if daily_changed and self._generation == generation and daily_rows:
+                self._apply_daily_delta(daily_rows)
+            if daily_changed or monthly_changed:
+                self._generation = generation + 1 if self._generation == generation else None
+        if daily_changed or monthly_changed:
+            print(f"History store merged {daily_changed} daily and {monthly_changed} monthly new or changed rows")
+        return daily_changed, monthly_changed
+    def _apply_daily_delta(self, daily_rows):
+        delta_dates = np.array([row[0] for row in daily_rows], dtype='datetime64[D]')
+        delta_prices = np.array([np.nan if row[1] is None else row[1] for row in daily_rows], dtype=np.float64)
+        dates = np.concatenate([delta_dates[::-1], self._dates])
+        prices = np.concatenate([delta_prices[::-1], self._prices])
+        dates, first = np.unique(dates, return_index=True)
+        self._dates, self._prices = dates, prices[first]
+        self._freeze()
+    def _freeze(self):
+        self._dates.setflags(write=False)
+        self._prices.setflags(write=False)
+    def _load_daily(self, conn):
+        rows = conn.execute("SELECT date, price_per_gram FROM daily_prices ORDER BY date").fetchall()
+        self._dates = np.array([row[0] for row in rows], dtype='datetime64[D]')
+        self._prices = np.array([np.nan if row[1] is None else row[1] for row in rows], dtype=np.float64)
+        self._freeze()
+    def daily_series(self):
+        """Return (dates, prices) as read-only datetime64[D]/float64 arrays sorted by date, without copying"""
+        with self._lock:
+            with self._connect() as conn:
+                generation = self._read_generation(conn)
+                if self._generation != generation or self._dates is None:
+                    self._load_daily(conn)
+                    self._generation = generation
+            return self._dates, self._prices
+    def daily_frame(self):
+        """Daily history shaped like build_frames' output, built over the in-memory arrays"""
+        import pandas as pd
+        dates, prices = self.daily_series()
+        return pd.DataFrame({'Price_per_gram': prices}, index=pd.DatetimeIndex(dates.astype('datetime64[ns]'), name='Date'), copy=False)
+    def monthly_frame(self):
+        """Monthly history shaped like build_frames' output"""
+        import pandas as pd
+        with self._connect() as conn:
+            rows = conn.execute("SELECT month, start_per_gram, end_per_gram, change_rs, percent_change, average_per_gram "
+                                "FROM monthly_prices ORDER BY month").fetchall()
+        index = pd.DatetimeIndex(np.array([row[0] for row in rows], dtype='datetime64[D]').astype('datetime64[ns]'), name='Date')
+        return pd.DataFrame([row[1:] for row in rows], columns=list(MONTHLY_FIELDS), index=index)
+_default_store = ProcessLocal(PriceHistoryStore)
+def get_history_store():
+    """Per-process history store at GOLD_HISTORY_PATH"""
+    return _default_store.get()
+def history_enabled():
+    return os.environ.get('GOLD_HISTORY_ENABLED', '1').lower() not in ('0', 'false', 'no')
+def history_frames(daily_data, monthly_data, store=None):
+    """Merge a scrape into the history store and return the full history as (daily_df, monthly_df) for forecast_frames"""
+    store = store or get_history_store()
+    store.merge(daily_data, monthly_data)
+    return store.daily_frame(), store.monthly_frame()
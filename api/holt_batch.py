@@ -0,0 +1,196 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+def holt_grid(alpha_values, beta_values, phi_values=None):
+    """Expand parameter lists into flat candidate arrays in nested-loop order"""
+    if phi_values is None:
+        alpha, beta = np.meshgrid(np.asarray(alpha_values, dtype=np.float64),
+                                  np.asarray(beta_values, dtype=np.float64), indexing='ij')
+        phi = np.ones_like(alpha)
+    else:
+        alpha, beta, phi = np.meshgrid(np.asarray(alpha_values, dtype=np.float64),
+                                       np.asarray(beta_values, dtype=np.float64),
+                                       np.asarray(phi_values, dtype=np.float64), indexing='ij')
+    return alpha.ravel(), beta.ravel(), phi.ravel()
+def fit_holt_batch(values, alpha, beta, phi, start=1):
+    """Run Holt's recursion for every candidate at once, returning final (level, trend) arrays.
+
+    The state starts at level=y[0], trend=y[1]-y[0] and folds in observations from index `start`:
+    1 matches HoltMethod, 0 matches statsmodels' Holt with legacy initialisation and optimized=False.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    alpha = np.asarray(alpha, dtype=np.float64)
+    beta = np.asarray(beta, dtype=np.float64)
+    phi = np.asarray(phi, dtype=np.float64)
+    n = len(values)
+    level = np.full(alpha.shape, values[0])
+    trend = np.full(alpha.shape, values[1] - values[0] if n > 1 else 0.0)
+    one_minus_alpha = 1 - alpha
+    damped_beta = (1 - beta) * phi
+    for t in range(start, n):
+        prev_level = level
+        level = alpha * values[t] + one_minus_alpha * (prev_level + phi * trend)
+        trend = beta * (level - prev_level) + damped_beta * trend
+    return level, trend
+def horizon_weights(phi, steps):
+    """Cumulative damping factors sum(phi**i, i=1..h) for h=1..steps, one row per candidate"""
+    phi = np.asarray(phi, dtype=np.float64)
+    powers = np.power(phi[..., None], np.arange(1, steps + 1, dtype=np.float64))
+    return np.cumsum(powers, axis=-1)
+def forecast_holt_batch(level, trend, phi, steps):
+    """Forecast `steps` ahead for every candidate, shape (candidates, steps)"""
+    level = np.asarray(level, dtype=np.float64)
+    trend = np.asarray(trend, dtype=np.float64)
+    return level[..., None] + horizon_weights(phi, steps) * trend[..., None]
+def fit_holt_pruned(values, alpha, beta, phi, start=1, prune_ratio=2.0, check_every=None):
+    """fit_holt_batch that drops candidates whose in-sample error falls too far behind, for early stopping.
+
+    Every `check_every` steps (default a tenth of the series) candidates whose running one-step-ahead
+    squared error exceeds `prune_ratio` times the best running error of all candidates stop being
+    advanced. The recursion is written in error-correction form with in-place updates, which matches
+    fit_holt_batch up to rounding while scoring the errors at no extra cost. Returns the indices of the
+    surviving candidates and their final (level, trend).
+    """
+    if prune_ratio < 1:
+        raise ValueError("prune_ratio must be at least 1")
+    values = np.asarray(values, dtype=np.float64)
+    alpha = np.asarray(alpha, dtype=np.float64)
+    beta = np.asarray(beta, dtype=np.float64)
+    phi = np.asarray(phi, dtype=np.float64)
+    n = len(values)
+    check_every = check_every or max((n - start) // 10, 1)
+    survivors = np.arange(len(alpha))
+    level = np.full(alpha.shape, values[0])
+    trend = np.full(alpha.shape, values[1] - values[0] if n > 1 else 0.0)
+    alpha_beta = alpha * beta
+    squared_error = np.zeros(alpha.shape)
+    error = np.empty(alpha.shape)
+    for t in range(start, n):
+        np.multiply(phi, trend, out=trend)
+        level += trend
+        np.subtract(values[t], level, out=error)
+        level += alpha * error
+        trend += alpha_beta * error
+        error *= error
+        squared_error += error
+        if (t + 1 - start) % check_every == 0 and t + 1 < n:
+            score = np.where(np.isnan(squared_error), np.inf, squared_error)
+            keep = score <= prune_ratio * score.min()
+            if not keep.all():
+                survivors, alpha, phi, alpha_beta = survivors[keep], alpha[keep], phi[keep], alpha_beta[keep]
+                level, trend, squared_error, error = level[keep], trend[keep], squared_error[keep], error[keep]
+    return survivors, level, trend
+def evaluate_holt_batch(train, test, alpha, beta, phi, start=1, prune_ratio=None):
+    """Fit all candidates on `train` and score their forecasts against `test`, returning (rmse, mae, fitted) arrays.
+
+    `fitted` marks the candidates that were fitted in full: all of them, unless `prune_ratio` is set and
+    fit_holt_pruned stopped some early, in which case those score inf.
+    """
+    test = np.asarray(test, dtype=np.float64)
+    if prune_ratio is not None:
+        phi = np.asarray(phi, dtype=np.float64)
+        rmse = np.full(phi.shape, np.inf)
+        mae = np.full(phi.shape, np.inf)
+        fitted = np.zeros(phi.shape, dtype=bool)
+        survivors, level, trend = fit_holt_pruned(train, alpha, beta, phi, start, prune_ratio)
+        errors = test - forecast_holt_batch(level, trend, phi[survivors], len(test))
+        rmse[survivors] = np.sqrt(np.mean(errors ** 2, axis=-1))
+        mae[survivors] = np.mean(np.abs(errors), axis=-1)
+        fitted[survivors] = True
+        return rmse, mae, fitted
+    level, trend = fit_holt_batch(train, alpha, beta, phi, start)
+    errors = test - forecast_holt_batch(level, trend, phi, len(test))
+    rmse = np.sqrt(np.mean(errors ** 2, axis=-1))
+    mae = np.mean(np.abs(errors), axis=-1)
+    return rmse, mae, np.ones(rmse.shape, dtype=bool)
+def holt_forecast(values, alpha, beta, phi=1.0, steps=3, start=1):
+    """Fit a single parameter set and forecast `steps` ahead"""
+    level, trend = fit_holt_batch(values, [alpha], [beta], [phi], start)
+    return forecast_holt_batch(level, trend, [phi], steps)[0]
+def holt_residuals(values, alpha, beta, phi=1.0, start=1):
+    """One-step-ahead errors of a single parameter set, skipping the first folded observation whose forecast uses y[1]"""
+    values = np.asarray(values, dtype=np.float64)
+    level = values[0]
+    trend = values[1] - values[0] if len(values) > 1 else 0.0
+    errors = np.empty(max(len(values) - start - 1, 0), dtype=np.float64)
+    for t in range(start, len(values)):
+        prev_level = level
+        fitted = prev_level + phi * trend
+        if t > start:
+            errors[t - start - 1] = values[t] - fitted
+        level = alpha * values[t] + (1 - alpha) * fitted
+        trend = beta * (level - prev_level) + (1 - beta) * phi * trend
+    return errors
+def best_candidate(rmse):
+    """Index of the lowest RMSE; ties resolve to the first candidate like the serial search"""
+    rmse = np.where(np.isnan(rmse), np.inf, rmse)
+    index = int(np.argmin(rmse))
+    return index if np.isfinite(rmse[index]) else None
+_executor = None
+_executor_workers = None
+_executor_lock = threading.Lock()
+_attached = None
+def search_workers():
+    """Worker processes for grid search from GOLD_SEARCH_WORKERS (1 keeps the search in-process, 0 uses every core)"""
+    workers = int(os.environ.get('GOLD_SEARCH_WORKERS', 1))
+    return os.cpu_count() or 1 if workers == 0 else max(workers, 1)
+def _get_executor(workers):
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _executor_workers = workers
+            atexit.register(_executor.shutdown, wait=False)
+        return _executor
+def _shared_series(name, n_train, n_test):
+    """Attach to the parent's series segment once per worker and reuse it for every chunk of the same search"""
+    global _attached
+    if _attached is None or _attached[0] != name:
+        if _attached is not None:
+            _attached[1].close()
+        segment = shared_memory.SharedMemory(name=name)
+        _attached = (name, segment)
+    series = np.ndarray((n_train + n_test,), dtype=np.float64, buffer=_attached[1].buf)
+    return series[:n_train], series[n_train:]
+def _evaluate_chunk(name, n_train, n_test, alpha, beta, phi, start):
+    train, test = _shared_series(name, n_train, n_test)
+    return evaluate_holt_batch(train, test, alpha, beta, phi, start)
+def evaluate_holt_batch_parallel(train, test, alpha, beta, phi, start=1, workers=None, chunk_size=None, prune_ratio=None):
+    """evaluate_holt_batch split into candidate chunks across a process pool.
+
+    The series is placed in shared memory once per call; tasks only carry its name and their
+    slice of the parameter arrays. Chunks are reassembled in candidate order, so
+    best_candidate() breaks ties exactly as the serial search does. Early stopping (`prune_ratio`)
+    compares every candidate against the best of the whole grid, so setting it disables parallelism:
+    the grid is then evaluated in-process whatever the number of workers.
+    """
+    workers = workers or search_workers()
+    alpha = np.asarray(alpha, dtype=np.float64)
+    beta = np.asarray(beta, dtype=np.float64)
+    phi = np.asarray(phi, dtype=np.float64)
+    if workers <= 1 or len(alpha) < 2 or prune_ratio is not None:
+        return evaluate_holt_batch(train, test, alpha, beta, phi, start, prune_ratio)
+    train = np.asarray(train, dtype=np.float64)
+    test = np.asarray(test, dtype=np.float64)
+    chunk_size = chunk_size or max(-(-len(alpha) // (workers * 4)), 1)
+    segment = shared_memory.SharedMemory(create=True, size=max((len(train) + len(test)) * 8, 1))
+    try:
+        series = np.ndarray((len(train) + len(test),), dtype=np.float64, buffer=segment.buf)
+        series[:len(train)] = train
+        series[len(train):] = test
+        executor = _get_executor(workers)
+        futures = [executor.submit(_evaluate_chunk, segment.name, len(train), len(test),
+                                   alpha[offset:offset + chunk_size], beta[offset:offset + chunk_size], phi[offset:offset + chunk_size], start)
+                   for offset in range(0, len(alpha), chunk_size)]
+        results = [future.result() for future in futures]
+        del series
+    finally:
+        segment.close()
+        segment.unlink()
+    return tuple(np.concatenate([r[i] for r in results]) for i in range(3))
@@ -0,0 +1,26 @@
+import numpy as np
+DAILY_DATE_FORMAT = '%b %d, %Y'
+MONTH_FORMAT = '%B %y'
+def _datetimes(texts, date_format):
+    import pandas as pd
+    return pd.to_datetime(pd.Series(texts, dtype=object), format=date_format).to_numpy(dtype='datetime64[ns]')
+def parse_prices(texts):
+    """Rupee amounts such as '₹95,740.50' to a float64 array, NaN where a text is not a number; numbers pass through"""
+    import pandas as pd
+    column = pd.Series(texts, dtype=object)
+    if not pd.api.types.is_numeric_dtype(column.infer_objects()):
+        cleaned = column.str.replace('₹', '', regex=False).str.replace(',', '', regex=False)
+        column = cleaned.where(column.map(lambda value: isinstance(value, str)), column)
+    return pd.to_numeric(column, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+def parse_daily_dates(texts):
+    """Dates such as 'May 29, 2025' (DAILY_DATE_FORMAT) to a datetime64[ns] array; raises ValueError on a malformed date"""
+    return _datetimes(texts, DAILY_DATE_FORMAT)
+def parse_months(texts):
+    """Month labels such as 'April 25' (MONTH_FORMAT) to a datetime64[ns] array of month starts, always in 20yy; raises ValueError on a malformed label"""
+    labels = (str(text).rpartition(' ') for text in texts)
+    return _datetimes([f"{month} 20{year}" for month, _, year in labels], MONTH_FORMAT.replace('%y', '%Y'))
+def float_records_column(values):
+    """float64 array to a list of Python floats with None in place of NaN, as stored in scraped records"""
+    column = values.astype(object)
+    column[np.isnan(values)] = None
+    return column.tolist()
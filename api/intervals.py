@@ -0,0 +1,77 @@
+import os
+import statistics
+import numpy as np
+from api.holt_batch import horizon_weights
+INTERVAL_METHODS = ('bootstrap', 'normal')
+MIN_RESIDUALS = 5
+def interval_paths():
+    """Simulated paths per bootstrap interval from GOLD_INTERVAL_PATHS (0 disables intervals)"""
+    return int(os.environ.get('GOLD_INTERVAL_PATHS', 10000))
+def interval_level():
+    return float(os.environ.get('GOLD_INTERVAL_LEVEL', 0.95))
+def interval_method():
+    """Interval method named in GOLD_INTERVAL_METHOD ('bootstrap' or 'normal'), default 'bootstrap'"""
+    method = os.environ.get('GOLD_INTERVAL_METHOD', 'bootstrap').strip()
+    if method not in INTERVAL_METHODS:
+        raise ValueError(f"Unknown interval method '{method}', expected one of {', '.join(INTERVAL_METHODS)}")
+    return method
+def interval_seed():
+    """Seed for the bootstrap draws, so an unchanged fit republishes identical bands (and ETags)"""
+    return int(os.environ.get('GOLD_INTERVAL_SEED', 0))
+def error_weights(alpha, beta, phi, steps):
+    """Weight of the error j steps ahead in the forecast j + k steps ahead, for k = 0..steps-1.
+
+    In error-correction form an error e moves the level by alpha * e and the trend by
+    alpha * beta * e, so it shifts the forecast k steps later by alpha * (1 + beta * sum(phi**i, i=1..k)).
+    """
+    weights = np.empty(steps, dtype=np.float64)
+    weights[0] = 1.0
+    weights[1:] = alpha * (1 + beta * horizon_weights(phi, steps - 1))
+    return weights
+def propagation_matrix(alpha, beta, phi, steps):
+    """Upper-triangular (steps, steps) matrix mapping future errors to forecast deviations: deviations = errors @ matrix"""
+    lag = np.subtract.outer(np.arange(steps), np.arange(steps)).T
+    return np.where(lag >= 0, error_weights(alpha, beta, phi, steps)[np.maximum(lag, 0)], 0.0)
+def simulate_paths(point_forecast, residuals, alpha, beta, phi=1.0, paths=None, seed=None):
+    """Bootstrap (paths, steps) future trajectories by resampling one-step residuals.
+
+    Every path draws its errors at once and they are propagated through Holt's recursion with a
+    single matrix product, so there is no loop over paths or steps. The result is a transposed view
+    of a (steps, paths) array, so per-step statistics read contiguous memory.
+    """
+    point_forecast = np.asarray(point_forecast, dtype=np.float64)
+    residuals = np.asarray(residuals, dtype=np.float64)
+    steps = len(point_forecast)
+    rng = np.random.default_rng(interval_seed() if seed is None else seed)
+    errors = residuals[rng.integers(0, len(residuals), size=(steps, interval_paths() if paths is None else paths))]
+    return (propagation_matrix(alpha, beta, phi, steps).T @ errors + point_forecast[:, None]).T
+def _sorted_quantiles(rows, quantiles):
+    """np.quantile's default linear interpolation along the last axis of already sorted rows"""
+    position = np.asarray(quantiles, dtype=np.float64) * (rows.shape[-1] - 1)
+    below = np.floor(position).astype(np.int64)
+    above = np.minimum(below + 1, rows.shape[-1] - 1)
+    return rows[:, below] + (position - below) * (rows[:, above] - rows[:, below])
+def forecast_interval(point_forecast, residuals, alpha, beta, phi=1.0, level=None, method=None, paths=None, seed=None):
+    """Return (lower, upper) bounds at `level` for a Holt point forecast, or None without enough residuals.
+
+    Residuals are centred first, so the bands are spread around the point forecast rather than
+    shifted by the in-sample bias (which the recursion would otherwise compound over the horizon).
+    'bootstrap' takes quantiles of simulate_paths; 'normal' uses the closed-form forecast variance
+    var(residuals) * cumsum(error_weights**2) under Gaussian errors.
+    """
+    level = interval_level() if level is None else level
+    method = interval_method() if method is None else method
+    paths = interval_paths() if paths is None else paths
+    residuals = np.asarray(residuals, dtype=np.float64)
+    residuals = residuals[np.isfinite(residuals)]
+    residuals = residuals - residuals.mean() if len(residuals) else residuals
+    point_forecast = np.asarray(point_forecast, dtype=np.float64)
+    if len(residuals) < MIN_RESIDUALS or len(point_forecast) == 0 or (method == 'bootstrap' and paths <= 0):
+        return None
+    if method == 'normal':
+        z = statistics.NormalDist().inv_cdf((1 + level) / 2)
+        spread = z * np.sqrt(np.var(residuals) * np.cumsum(error_weights(alpha, beta, phi, len(point_forecast)) ** 2))
+        return point_forecast - spread, point_forecast + spread
+    simulated = np.sort(simulate_paths(point_forecast, residuals, alpha, beta, phi, paths, seed).T, axis=1)
+    bounds = _sorted_quantiles(simulated, [(1 - level) / 2, (1 + level) / 2])
+    return bounds[:, 0], bounds[:, 1]
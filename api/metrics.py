@@ -0,0 +1,113 @@
+import bisect
+import contextlib
+import os
+import re
+import threading
+import time
+from api.process_local import ProcessLocal
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+METRIC_HELP = {
+    'gold_stage_duration_seconds': 'Time spent in each scrape, tuning and serving stage',
+    'gold_http_request_duration_seconds': 'HTTP request latency by endpoint and status',
+    'gold_scrape_attempts_total': 'Scraper backend attempts by outcome',
+    'gold_cache_lookups_total': 'Scrape cache lookups by outcome',
+    'gold_daily_model_total': 'Daily model refreshes by whether saved state was resumed, a memoized tuning reused, or the model warm-started or retuned',
+    'gold_refresh_total': 'Scheduled forecast refreshes by outcome',
+}
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+def _format_labels(labels):
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}' if labels else ''
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+class MetricsRegistry:
+    """Process-local counters and latency histograms, rendered in the Prometheus text format.
+
+    Updates take one lock and a bisect, so they are cheap enough to leave on in every code path.
+    Each worker process keeps its own registry; scrape every worker or aggregate downstream.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+    def inc(self, name, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+    def observe(self, name, value, **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            entry = series.get(key)
+            if entry is None:
+                entry = series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+    @contextlib.contextmanager
+    def timer(self, name='gold_stage_duration_seconds', **labels):
+        """Observe the wall time of the block, including when it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+    def stage(self, stage):
+        return self.timer('gold_stage_duration_seconds', stage=stage)
+    def render(self):
+        lines = []
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {name: {key: (list(entry[0]), entry[1], entry[2]) for key, entry in series.items()}
+                          for name, series in self._histograms.items()}
+        for name in sorted(counters):
+            lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in sorted(counters[name].items()):
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        for name in sorted(histograms):
+            lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, (counts, total, count) in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(key)} {total!r}")
+                lines.append(f"{name}_count{_format_labels(key)} {count}")
+        return '\n'.join(lines) + '\n'
+_registry = ProcessLocal(MetricsRegistry)
+def get_metrics():
+    """Registry for this process; a forked worker starts from empty rather than the parent's counts"""
+    return _registry.get()
+_profile_lock = threading.Lock()
+def profile_dir():
+    """Directory for per-request cProfile dumps from GOLD_PROFILE_DIR; unset disables profiling"""
+    return os.environ.get('GOLD_PROFILE_DIR') or None
+@contextlib.contextmanager
+def profiled(label):
+    """Profile the block with cProfile into GOLD_PROFILE_DIR/<label>-<ns>-<pid>.prof when profiling is enabled.
+
+    Only one block is profiled at a time per process; concurrent blocks run unprofiled.
+    """
+    directory = profile_dir()
+    if directory is None or not _profile_lock.acquire(blocking=False):
+        yield
+        return
+    import cProfile
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+        os.makedirs(directory, exist_ok=True)
+        safe_label = re.sub(r'[^A-Za-z0-9_.-]+', '_', label).strip('_') or 'request'
+        profiler.dump_stats(os.path.join(directory, f"{safe_label}-{time.time_ns()}-{os.getpid()}.prof"))
+    finally:
+        _profile_lock.release()
@@ -0,0 +1,32 @@
+import json
+import os
+import time
+from api.process_local import ProcessLocal
+from api.sqlite_store import connect, prepare_path
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'gold_model_state.sqlite3')
+class ModelStateStore:
+    """SQLite store for fitted model state, so refreshes can resume instead of refitting from scratch"""
+    def __init__(self, path=None):
+        self.path = prepare_path(path or os.environ.get('GOLD_MODEL_STATE_PATH', DEFAULT_STATE_PATH))
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS model_state (name TEXT PRIMARY KEY, state TEXT NOT NULL, saved_at REAL NOT NULL)")
+    def _connect(self):
+        return connect(self.path)
+    def load(self, name):
+        with self._connect() as conn:
+            row = conn.execute("SELECT state FROM model_state WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+    def save(self, name, state):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO model_state (name, state, saved_at) VALUES (?, ?, ?)",
+                         (name, json.dumps(state), time.time()))
+    def clear(self, name=None):
+        with self._connect() as conn:
+            if name is None:
+                conn.execute("DELETE FROM model_state")
+            else:
+                conn.execute("DELETE FROM model_state WHERE name = ?", (name,))
+_default_store = ProcessLocal(ModelStateStore)
+def get_model_state_store():
+    """Per-process model state store at GOLD_MODEL_STATE_PATH"""
+    return _default_store.get()
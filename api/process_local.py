@@ -0,0 +1,31 @@
+import os
+import threading
+class ProcessLocal:
+    """Lazily built object owned by the current process.
+
+    The first get() in a process calls `factory()`. A forked child, such as a Gunicorn worker, builds
+    its own instance rather than using the parent's, so connections, locks and threads are never
+    shared across processes. `on_create` is called with every new instance.
+    """
+    def __init__(self, factory, on_create=None):
+        self.factory = factory
+        self.on_create = on_create
+        self._instance = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+    def _after_fork(self):
+        self._lock = threading.Lock()
+    def get(self):
+        with self._lock:
+            if self._instance is None or self._pid != os.getpid():
+                self._instance = self.factory()
+                self._pid = os.getpid()
+                if self.on_create is not None:
+                    self.on_create(self._instance)
+            return self._instance
+    def reset(self):
+        """Forget the instance, so the next get() builds a new one (e.g. after the environment changed)"""
+        with self._lock:
+            self._instance = None
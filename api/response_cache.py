@@ -0,0 +1,78 @@
+import gzip
+import hashlib
+import json
+import threading
+from werkzeug.http import parse_accept_header
+from api.metrics import get_metrics
+LAYOUTS = ('records', 'columnar')
+def _iso_date(value):
+    return value.strftime('%Y-%m-%d') if hasattr(value, 'strftime') else value
+def to_columnar(results):
+    """Rewrite the row lists in a forecast result as parallel arrays, with ISO dates"""
+    columnar = dict(results)
+    daily = results.get('daily_data') or []
+    monthly = results.get('monthly_data') or []
+    columnar['daily_data'] = {
+        'Date': [_iso_date(row['Date']) for row in daily],
+        'Price_per_gram': [row['Price_per_gram'] for row in daily],
+    }
+    columnar['monthly_data'] = {key: [row[key] for row in monthly] for key in (monthly[0].keys() if monthly else ())}
+    return columnar
+def _brotli():
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        return None
+class PreparedResponse:
+    """JSON body of one result in one layout, serialized once and compressed on first request per encoding"""
+    def __init__(self, body):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self._encoded = {'identity': body}
+        self._lock = threading.Lock()
+    def encoded(self, encoding):
+        with self._lock:
+            if encoding not in self._encoded:
+                if encoding == 'gzip':
+                    self._encoded[encoding] = gzip.compress(self.body, compresslevel=6, mtime=0)
+                elif encoding == 'br':
+                    self._encoded[encoding] = _brotli().compress(self.body)
+                else:
+                    raise ValueError(f"Unsupported encoding '{encoding}'")
+            return self._encoded[encoding]
+    def etag_for(self, encoding):
+        """Strong validator per representation, so compressed and identity bodies never share an ETag"""
+        return self.etag if encoding == 'identity' else self.etag[:-1] + '-' + encoding + '"'
+    @staticmethod
+    def negotiate(accept_encoding):
+        """Highest-quality encoding the client accepts, brotli first on ties; 'identity' when none is acceptable"""
+        accepted = parse_accept_header(accept_encoding or '')
+        offered = ['br', 'gzip'] if _brotli() is not None else ['gzip']
+        quality, _, encoding = max((accepted[encoding], -rank, encoding) for rank, encoding in enumerate(offered))
+        return encoding if quality > 0 else 'identity'
+class ResponseCache:
+    """Holds the serialized forms of the latest published result, rebuilt only when the result object changes"""
+    def __init__(self, dumps=None):
+        self.dumps = dumps or (lambda obj: json.dumps(obj, separators=(',', ':')))
+        self._source = None
+        self._prepared = {}
+        self._lock = threading.Lock()
+    def get(self, source, layout='records', payload=None):
+        """Prepared body for `source` (the published result object, compared by identity) in `layout`.
+
+        `payload` optionally builds the dict to serialize from `source`; by default `source` itself is used.
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout '{layout}', expected one of {', '.join(LAYOUTS)}")
+        with self._lock:
+            if self._source is not source:
+                self._source = source
+                self._prepared = {}
+            prepared = self._prepared.get(layout)
+            if prepared is None:
+                results = payload(source) if payload is not None else source
+                with get_metrics().stage('serialize_response'):
+                    prepared = PreparedResponse(self.dumps(to_columnar(results) if layout == 'columnar' else results).encode('utf-8'))
+                self._prepared[layout] = prepared
+            return prepared
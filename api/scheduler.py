@@ -0,0 +1,118 @@
+import datetime
+import os
+import threading
+class CronSchedule:
+    """Minimal five-field cron expression (minute hour day month weekday) supporting *, */n, a-b and a,b.
+
+    As in cron, when both day of month and weekday are restricted (neither starts with '*') a day
+    matching either one matches; otherwise both must match.
+    """
+    _bounds = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields, got '{expression}'")
+        self.expression = expression
+        self.fields = [self._parse_field(field, low, high) for field, (low, high) in zip(fields, self._bounds)]
+        self.either_day = not fields[2].startswith('*') and not fields[4].startswith('*')
+    @staticmethod
+    def _parse_field(field, low, high):
+        allowed = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step = part.split('/')
+                step = int(step)
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start, end = (int(x) for x in part.split('-'))
+            else:
+                start = end = int(part)
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(f"Invalid cron field '{field}'")
+            allowed.update(range(start, end + 1, step))
+        return allowed
+    def matches(self, moment):
+        minutes, hours, days, months, weekdays = self.fields
+        day_matches, weekday_matches = moment.day in days, (moment.weekday() + 1) % 7 in weekdays
+        day = day_matches or weekday_matches if self.either_day else day_matches and weekday_matches
+        return moment.minute in minutes and moment.hour in hours and moment.month in months and day
+    def next_after(self, moment):
+        """First matching minute strictly after `moment`"""
+        candidate = moment.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        for _ in range(366 * 24 * 60):
+            if self.matches(candidate):
+                return candidate
+            candidate += datetime.timedelta(minutes=1)
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+class ForecastSnapshot:
+    __slots__ = ('results', 'generated_at')
+    def __init__(self, results, generated_at):
+        self.results = results
+        self.generated_at = generated_at
+class RefreshScheduler:
+    """Runs `job()` on an interval or cron schedule in a daemon thread and publishes its latest result.
+
+    `job` returns the new results, or None when the refresh failed; failures keep the previous snapshot.
+    """
+    def __init__(self, job, interval=None, cron=None, retry_interval=60):
+        self.job = job
+        self.interval = float(interval if interval is not None else os.environ.get('GOLD_REFRESH_INTERVAL', 900))
+        cron = cron if cron is not None else os.environ.get('GOLD_REFRESH_CRON')
+        self.cron = CronSchedule(cron) if cron else None
+        self.retry_interval = retry_interval
+        self._snapshot = None
+        self._last_attempt_failed = False
+        self._run_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+    @property
+    def snapshot(self):
+        return self._snapshot
+    def refresh_now(self):
+        """Run the job synchronously and publish its result; concurrent callers share a single run"""
+        if not self._run_lock.acquire(blocking=False):
+            self._run_lock.acquire()
+            self._run_lock.release()
+            return self._snapshot
+        try:
+            try:
+                results = self.job()
+            except Exception as e:
+                print(f"Scheduled refresh failed: {e}")
+                results = None
+            self._last_attempt_failed = results is None
+            if results is not None:
+                self._snapshot = ForecastSnapshot(results, datetime.datetime.now(datetime.timezone.utc))
+                print(f"Published forecast snapshot generated at {self._snapshot.generated_at.isoformat()}")
+            return self._snapshot
+        finally:
+            self._ready.set()
+            self._run_lock.release()
+    def wait_for_snapshot(self, timeout=None):
+        self._ready.wait(timeout)
+        return self._snapshot
+    def seconds_until_next_run(self):
+        if self._snapshot is None or self._last_attempt_failed:
+            return self.retry_interval
+        if self.cron is not None:
+            now = datetime.datetime.now()
+            return (self.cron.next_after(now) - now).total_seconds()
+        elapsed = (datetime.datetime.now(datetime.timezone.utc) - self._snapshot.generated_at).total_seconds()
+        return max(self.interval - elapsed, 0)
+    def _run(self):
+        self.refresh_now()
+        while not self._stop.wait(self.seconds_until_next_run()):
+            self.refresh_now()
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="forecast-refresh", daemon=True)
+            self._thread.start()
+        return self
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
@@ -0,0 +1,148 @@
+import abc
+import os
+from api.metrics import get_metrics
+DEFAULT_GOLD_RATE_URL = "https://economictimes.indiatimes.com/markets/gold-rate-in-india-today"
+DAILY_TABLE_SELECTOR = 'table.table.lg_txt.rf_rr'
+MONTHLY_TABLE_SELECTOR = '#monthTrend24c table'
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+EXTRACT_TABLES_JS = """
+    var dailyTable = document.querySelector('table.table.lg_txt.rf_rr');
+    var monthlyTable = document.querySelector('#monthTrend24c table');
+    var dailyRows = Array.from(dailyTable.querySelectorAll('tr')).slice(1);
+    var monthlyRows = Array.from(monthlyTable.querySelectorAll('tbody tr'));
+    var dailyData = dailyRows.map(row => {
+        var cells = row.querySelectorAll('td');
+        if (cells.length >= 3) {
+            return {
+                date: cells[0].textContent.trim(),
+                price: cells[2].querySelector('.text').textContent.trim()
+            };
+        }
+        return null;
+    }).filter(item => item !== null);   
+    var monthlyData = monthlyRows.map(row => {
+        var cells = row.querySelectorAll('td');
+        if (cells.length >= 6) {
+            return {
+                month: cells[0].textContent.trim(),
+                start: cells[1].textContent.trim(),
+                end: cells[2].textContent.trim(),
+                change: cells[3].querySelector('span') ? cells[3].querySelector('span').textContent.trim() : cells[3].textContent.trim(),
+                percent: cells[4].querySelector('span') ? cells[4].querySelector('span').textContent.trim() : cells[4].textContent.trim(),
+                average: cells[5].textContent.trim()
+            };
+        }
+        return null;
+    }).filter(item => item !== null);
+    return {daily: dailyData, monthly: monthlyData};
+"""
+class ScrapeError(Exception):
+    pass
+def _cell_text(cell, child_selector=None):
+    child = cell.select_one(child_selector) if child_selector else None
+    return (child or cell).get_text().strip()
+def parse_gold_page(html):
+    """Extract the daily and 24K monthly tables from the page HTML, mirroring EXTRACT_TABLES_JS"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    daily_table = soup.select_one(DAILY_TABLE_SELECTOR)
+    monthly_table = soup.select_one(MONTHLY_TABLE_SELECTOR)
+    if daily_table is None or monthly_table is None:
+        raise ScrapeError("Gold price tables not present in static HTML")
+    daily = []
+    for row in daily_table.find_all('tr')[1:]:
+        cells = row.find_all('td')
+        if len(cells) >= 3:
+            price = cells[2].select_one('.text')
+            if price is None:
+                raise ScrapeError("Daily price cell has no '.text' element")
+            daily.append({'date': _cell_text(cells[0]), 'price': price.get_text().strip()})
+    monthly = []
+    for row in monthly_table.select('tbody tr'):
+        cells = row.find_all('td')
+        if len(cells) >= 6:
+            monthly.append({
+                'month': _cell_text(cells[0]),
+                'start': _cell_text(cells[1]),
+                'end': _cell_text(cells[2]),
+                'change': _cell_text(cells[3], 'span'),
+                'percent': _cell_text(cells[4], 'span'),
+                'average': _cell_text(cells[5])
+            })
+    if not daily or not monthly:
+        raise ScrapeError("Gold price tables are empty in static HTML")
+    return {'daily': daily, 'monthly': monthly}
+class ScraperBackend(abc.ABC):
+    """Fetches the raw table rows as {'daily': [...], 'monthly': [...]} text records"""
+    name = None
+    @abc.abstractmethod
+    def fetch_tables(self):
+        pass
+def gold_rate_url():
+    """Page address from GOLD_RATE_URL, read on every fetch so it can be changed after import"""
+    return os.environ.get('GOLD_RATE_URL', DEFAULT_GOLD_RATE_URL)
+def fetch_html(url, timeout=10, session=None):
+    """GET `url` with requests (redirects, compression and chunked bodies handled there) and return the text"""
+    import requests
+    response = (session or requests).get(url, timeout=timeout, headers={'User-Agent': USER_AGENT})
+    response.raise_for_status()
+    return response.text
+class HttpScraperBackend(ScraperBackend):
+    """Plain HTTP GET plus HTML parsing; no browser involved"""
+    name = 'http'
+    def __init__(self, url=None, timeout=10, session=None):
+        import requests
+        self.url = url
+        self.timeout = timeout
+        self.session = session or requests.Session()
+    def fetch_tables(self):
+        print("Fetching Economic Times gold price page over HTTP...")
+        with get_metrics().stage('http_fetch'):
+            html = fetch_html(self.url or gold_rate_url(), self.timeout, self.session)
+        with get_metrics().stage('parse_html'):
+            return parse_gold_page(html)
+class SeleniumScraperBackend(ScraperBackend):
+    """Renders the page in a pooled headless Chrome and extracts the tables with injected JavaScript"""
+    name = 'selenium'
+    def __init__(self, url=None, page_load_timeout=10, wait_timeout=3):
+        self.url = url
+        self.page_load_timeout = page_load_timeout
+        self.wait_timeout = wait_timeout
+    def fetch_tables(self):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from api.driver_pool import get_driver_pool
+        with get_driver_pool().driver() as driver:
+            driver.set_page_load_timeout(self.page_load_timeout)
+            driver_wait = WebDriverWait(driver, self.wait_timeout)
+            print("Loading Economic Times gold price page...")
+            with get_metrics().stage('page_load'):
+                driver.get(self.url or gold_rate_url())
+                driver_wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
+                section_24k = driver.find_element(By.ID, "monthTrend24c")
+                driver.execute_script("arguments[0].scrollIntoView(true);", section_24k)
+            print("Extracting data from tables...")
+            with get_metrics().stage('extract_tables'):
+                return driver.execute_script(EXTRACT_TABLES_JS)
+SCRAPER_BACKENDS = {
+    HttpScraperBackend.name: HttpScraperBackend,
+    SeleniumScraperBackend.name: SeleniumScraperBackend,
+}
+def default_backends():
+    """Backends named in GOLD_SCRAPER_BACKENDS (comma-separated, tried in order), default 'http,selenium'"""
+    names = os.environ.get('GOLD_SCRAPER_BACKENDS', 'http,selenium')
+    return [SCRAPER_BACKENDS[name.strip()]() for name in names.split(',') if name.strip()]
+def scrape_tables(backends=None):
+    """Return raw table records from the first backend that succeeds"""
+    errors = []
+    for backend in backends if backends is not None else default_backends():
+        try:
+            tables = backend.fetch_tables()
+            get_metrics().inc('gold_scrape_attempts_total', backend=backend.name, result='success')
+            return tables
+        except Exception as e:
+            get_metrics().inc('gold_scrape_attempts_total', backend=backend.name, result='failure')
+            print(f"Scraper backend '{backend.name}' failed: {e}")
+            errors.append(f"{backend.name}: {e}")
+    raise ScrapeError("All scraper backends failed (" + "; ".join(errors) + ")")
@@ -0,0 +1,145 @@
+import abc
+import os
+import numpy as np
+from api.holt_batch import holt_grid, best_candidate
+class _Tracker:
+    """Wraps a vectorized score(alpha, beta, phi) -> (rmse, mae, fitted), counting candidates and keeping the first best.
+
+    Only the candidates fitted in full are counted, so those stopped early by pruning are not.
+    """
+    def __init__(self, score):
+        self.score = score
+        self.evaluations = 0
+        self.best = None
+    def __call__(self, alpha, beta, phi):
+        rmse, mae, fitted = self.score(alpha, beta, phi)
+        self.evaluations += int(np.count_nonzero(fitted))
+        best = best_candidate(rmse)
+        if best is not None and (self.best is None or rmse[best] < self.best['rmse']):
+            self.best = {'alpha': float(alpha[best]), 'beta': float(beta[best]), 'phi': float(phi[best]),
+                         'rmse': float(rmse[best]), 'mae': float(mae[best])}
+        return rmse
+    def result(self):
+        return None if self.best is None else dict(self.best, evaluations=self.evaluations)
+def _bounds(alpha_values, beta_values, phi_values):
+    lists = (alpha_values, beta_values) if phi_values is None else (alpha_values, beta_values, phi_values)
+    return np.array([[min(values), max(values)] for values in lists], dtype=np.float64)
+def _candidates(points):
+    """Split a (candidates, dims) array into alpha, beta, phi arrays, with phi=1 for the regular model"""
+    phi = points[:, 2] if points.shape[1] == 3 else np.ones(len(points))
+    return points[:, 0], points[:, 1], phi
+class SearchStrategy(abc.ABC):
+    """Finds the (alpha, beta, phi) with the lowest RMSE under a vectorized score(alpha, beta, phi) -> (rmse, mae, fitted).
+
+    The grid value lists give the search space: exhaustive search evaluates them as they are, the
+    other strategies only use their bounds. Without `phi_values` the regular (undamped) model is searched.
+    `start` is an optional (alpha, beta[, phi]) point, such as a previous optimum, to search around first;
+    strategies that ignore it set `uses_start` to False.
+    search() returns {'alpha', 'beta', 'phi', 'rmse', 'mae', 'evaluations'}, or None when nothing is finite.
+    """
+    name = None
+    uses_start = True
+    @abc.abstractmethod
+    def search(self, score, alpha_values, beta_values, phi_values=None, start=None):
+        pass
+class ExhaustiveSearch(SearchStrategy):
+    """Every combination of the grid values in one batch; `start` is ignored since the whole grid is scored anyway"""
+    name = 'exhaustive'
+    uses_start = False
+    def search(self, score, alpha_values, beta_values, phi_values=None, start=None):
+        tracker = _Tracker(score)
+        tracker(*holt_grid(alpha_values, beta_values, phi_values))
+        return tracker.result()
+class CoarseToFineSearch(SearchStrategy):
+    """A `points`-per-axis grid over the bounds, re-centred on the best candidate and shrunk each round.
+
+    With a `start` the first half of the rounds is skipped: the search begins in the box those rounds
+    would have narrowed to, centred on `start`, and ends at the same resolution.
+    """
+    name = 'coarse'
+    def __init__(self, points=5, rounds=4, shrink=0.5):
+        self.points = points
+        self.rounds = rounds
+        self.shrink = shrink
+    def search(self, score, alpha_values, beta_values, phi_values=None, start=None):
+        tracker = _Tracker(score)
+        bounds = _bounds(alpha_values, beta_values, phi_values)
+        low, high = bounds[:, 0], bounds[:, 1]
+        skipped = self.rounds // 2 if start is not None else 0
+        if skipped:
+            center = np.clip(np.asarray(start, dtype=np.float64)[:len(bounds)], low, high)
+            half_span = (high - low) * self.shrink ** skipped / 2
+            low = np.maximum(center - half_span, bounds[:, 0])
+            high = np.minimum(center + half_span, bounds[:, 1])
+        for _ in range(self.rounds - skipped):
+            axes = [np.linspace(lo, hi, self.points) for lo, hi in zip(low, high)]
+            tracker(*holt_grid(*axes))
+            if tracker.best is None:
+                break
+            center = np.array([tracker.best['alpha'], tracker.best['beta'], tracker.best['phi']])[:len(bounds)]
+            half_span = (high - low) * self.shrink / 2
+            low = np.maximum(center - half_span, bounds[:, 0])
+            high = np.minimum(center + half_span, bounds[:, 1])
+        return tracker.result()
+class BoundedSearch(SearchStrategy):
+    """Continuous compass search inside the bounds, started from the best few points of a coarse grid.
+
+    Each iteration scores the +/- step neighbours of every start along each axis in one batch; a start
+    moves to its best improving neighbour, or halves its step when there is none, until all steps fall
+    below `tolerance` of the range or `max_iterations` is reached. A `start` replaces the coarse grid
+    as the only starting point, with a step `warm_step` times the usual one.
+    """
+    name = 'bounded'
+    def __init__(self, seed_points=3, starts=3, tolerance=1e-2, max_iterations=30, warm_step=0.25):
+        self.seed_points = seed_points
+        self.starts = starts
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.warm_step = warm_step
+    def search(self, score, alpha_values, beta_values, phi_values=None, start=None):
+        tracker = _Tracker(score)
+        bounds = _bounds(alpha_values, beta_values, phi_values)
+        dims = len(bounds)
+        if start is None:
+            seeds = np.stack(holt_grid(*(np.linspace(lo, hi, self.seed_points) for lo, hi in bounds))[:dims], axis=1)
+        else:
+            seeds = np.clip(np.asarray(start, dtype=np.float64)[None, :dims], bounds[:, 0], bounds[:, 1])
+        rmse = tracker(*_candidates(seeds))
+        rmse = np.where(np.isnan(rmse), np.inf, rmse)
+        order = np.argsort(rmse, kind='stable')[:self.starts]
+        points, values = seeds[order], rmse[order]
+        points, values = points[np.isfinite(values)], values[np.isfinite(values)]
+        span = bounds[:, 1] - bounds[:, 0]
+        steps = np.tile(span / (self.seed_points - 1) / 2 * (self.warm_step if start is not None else 1), (len(points), 1))
+        directions = np.concatenate([np.eye(dims), -np.eye(dims)])
+        for _ in range(self.max_iterations):
+            active = np.any(steps > self.tolerance * span, axis=1)
+            if not active.any():
+                break
+            neighbours = np.clip(points[active, None, :] + directions[None, :, :] * steps[active, None, :],
+                                 bounds[:, 0], bounds[:, 1])
+            scores = tracker(*_candidates(neighbours.reshape(-1, dims))).reshape(neighbours.shape[:2])
+            scores = np.where(np.isnan(scores), np.inf, scores)
+            best = np.argmin(scores, axis=1)
+            best_scores = scores[np.arange(len(best)), best]
+            improved = best_scores < values[active]
+            rows = np.flatnonzero(active)
+            points[rows[improved]] = neighbours[improved, best[improved]]
+            values[rows[improved]] = best_scores[improved]
+            steps[rows[~improved]] /= 2
+        return tracker.result()
+SEARCH_STRATEGIES = {
+    ExhaustiveSearch.name: ExhaustiveSearch,
+    CoarseToFineSearch.name: CoarseToFineSearch,
+    BoundedSearch.name: BoundedSearch,
+}
+def default_strategy():
+    """Strategy named in GOLD_SEARCH_STRATEGY ('exhaustive', 'coarse' or 'bounded'), default 'exhaustive'"""
+    name = os.environ.get('GOLD_SEARCH_STRATEGY', 'exhaustive').strip()
+    if name not in SEARCH_STRATEGIES:
+        raise ValueError(f"Unknown search strategy '{name}', expected one of {', '.join(SEARCH_STRATEGIES)}")
+    return SEARCH_STRATEGIES[name]()
+def search_prune_ratio():
+    """Early-stopping ratio from GOLD_SEARCH_PRUNE_RATIO; unset disables pruning"""
+    ratio = os.environ.get('GOLD_SEARCH_PRUNE_RATIO')
+    return float(ratio) if ratio else None
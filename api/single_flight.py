@@ -0,0 +1,103 @@
+import os
+import pickle
+import threading
+import time
+from api.process_local import ProcessLocal
+from api.sqlite_store import connect, prepare_path
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+DEFAULT_SINGLE_FLIGHT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'gold_single_flight.sqlite3')
+class _Call:
+    __slots__ = ('done', 'result')
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+class SingleFlight:
+    """Runs one computation per key at a time and shares its result with every concurrent caller.
+
+    Threads in a process wait on the in-flight call. Across processes the running caller holds an
+    exclusive lock on <path>.<key>.lock, and publishes what it computes to a shared SQLite store.
+    A process that acquires the lock afterwards reuses that result, provided it was published
+    after the caller began waiting or is at most `max_age` seconds old. A caller waits at most
+    `timeout` seconds and then falls back to the last good published result, or None.
+    Without fcntl (Windows) only the in-process part applies.
+    """
+    def __init__(self, path=None, timeout=None, max_age=None, poll_interval=0.05):
+        self.path = prepare_path(path or os.environ.get('GOLD_SINGLE_FLIGHT_PATH', DEFAULT_SINGLE_FLIGHT_PATH))
+        self.timeout = float(timeout if timeout is not None else os.environ.get('GOLD_SINGLE_FLIGHT_TIMEOUT', 120))
+        self.max_age = float(max_age if max_age is not None else os.environ.get('GOLD_SINGLE_FLIGHT_MAX_AGE', 60))
+        self.poll_interval = poll_interval
+        self._calls = {}
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, payload BLOB NOT NULL, produced_at REAL NOT NULL)")
+    def _connect(self):
+        return connect(self.path)
+    def read(self, key):
+        """Return (result, produced_at) of the last good result published for `key`, or (None, None)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload, produced_at FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None, None
+        return pickle.loads(row[0]), row[1]
+    def write(self, key, result):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO results (key, payload, produced_at) VALUES (?, ?, ?)",
+                         (key, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), time.time()))
+    def last_good(self, key):
+        return self.read(key)[0]
+    def do(self, key, fn, max_age=None):
+        """Return `fn()` for `key`, computed at most once across concurrent callers in all processes.
+
+        `fn` returns the result, or None on failure (which is shared but never published).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            if call.done.wait(self.timeout):
+                return call.result
+            print(f"Timed out after {self.timeout:g}s waiting for in-flight '{key}'; using last good result")
+            return self.last_good(key)
+        try:
+            call.result = self._run_exclusive(key, fn, self.max_age if max_age is None else max_age)
+            return call.result
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+    def _run_exclusive(self, key, fn, max_age):
+        if fcntl is None:
+            return self._publish(key, fn())
+        waiting_since = time.time()
+        deadline = time.monotonic() + self.timeout
+        with open(f"{self.path}.{key}.lock", 'a') as lock_file:
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        print(f"Timed out after {self.timeout:g}s waiting for '{key}' in another process; using last good result")
+                        return self.last_good(key)
+                    time.sleep(self.poll_interval)
+            try:
+                result, produced_at = self.read(key)
+                if result is not None and (produced_at >= waiting_since or time.time() - produced_at <= max_age):
+                    print(f"Reusing '{key}' published {time.time() - produced_at:.1f}s ago")
+                    return result
+                return self._publish(key, fn())
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    def _publish(self, key, result):
+        if result is not None:
+            self.write(key, result)
+        return result
+_default_flight = ProcessLocal(SingleFlight)
+def get_single_flight():
+    """Per-process SingleFlight configured from GOLD_SINGLE_FLIGHT_* environment variables"""
+    return _default_flight.get()
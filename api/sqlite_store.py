@@ -0,0 +1,18 @@
+import contextlib
+import os
+import sqlite3
+def prepare_path(path):
+    """Create the directory holding a SQLite file, if it has one"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return path
+@contextlib.contextmanager
+def connect(path):
+    """Autocommit SQLite connection in WAL mode, so readers in other processes are not blocked by a writer"""
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        yield conn
+    finally:
+        conn.close()
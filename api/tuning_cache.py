@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from api.process_local import ProcessLocal
+from api.sqlite_store import connect, prepare_path
+def tuning_config(alpha_values, beta_values, phi_values, holdout, strategy, folds, prune_ratio):
+    """Digest of everything other than the series that a daily selection depends on"""
+    config = [[float(value) for value in alpha_values], [float(value) for value in beta_values],
+              [float(value) for value in phi_values], holdout, strategy.name, sorted(vars(strategy).items()), folds, prune_ratio]
+    return hashlib.sha1(json.dumps(config).encode('utf-8')).hexdigest()
+def tuning_key(config, fingerprint):
+    return hashlib.sha1(f'{config}:{fingerprint}'.encode('utf-8')).hexdigest()
+def warm_start_enabled():
+    return os.environ.get('GOLD_TUNING_WARM_START', '1') != '0'
+class TuningCache:
+    """Bounded LRU of daily tuning results, optionally spilling evicted entries to SQLite.
+
+    Values are JSON-serializable dicts (the selection and the fitted model state). Entries pushed out
+    of memory are written to `path` when one is set (GOLD_TUNING_CACHE_PATH), where at most
+    `max_spilled` of the most recently used are kept and read back on a later miss. The latest
+    value per search configuration is also kept as a hint for warm-starting the next search.
+    """
+    def __init__(self, max_entries=None, path=None, max_spilled=None):
+        self.max_entries = int(max_entries if max_entries is not None else os.environ.get('GOLD_TUNING_CACHE_SIZE', 32))
+        self.path = path if path is not None else os.environ.get('GOLD_TUNING_CACHE_PATH') or None
+        self.max_spilled = int(max_spilled if max_spilled is not None else os.environ.get('GOLD_TUNING_CACHE_SPILL_SIZE', 1024))
+        self._entries = OrderedDict()
+        self._hints = {}
+        self._lock = threading.Lock()
+        if self.path:
+            prepare_path(self.path)
+            with self._connect() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, used_at REAL NOT NULL)")
+    def _connect(self):
+        return connect(self.path)
+    def _spill(self, items):
+        if not self.path or not items:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO entries (key, value, used_at) VALUES (?, ?, ?)",
+                             [(key, json.dumps(value), now) for key, value in items])
+            conn.execute("DELETE FROM entries WHERE key NOT IN (SELECT key FROM entries ORDER BY used_at DESC LIMIT ?)",
+                         (self.max_spilled,))
+    def _read_spilled(self, key):
+        if not self.path:
+            return None
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE entries SET used_at = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0]) if row is not None else None
+    def _insert(self, key, value):
+        """Store in memory and return the entries evicted to make room"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False))
+        return evicted
+    def get(self, key):
+        """Cached value for `key` from memory or the spill file, or None"""
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = self._read_spilled(key)
+        if value is not None:
+            self._spill(self._insert(key, value))
+        return value
+    def put(self, key, value, config=None, hint=None):
+        """Cache `value` under `key`, and remember `hint` as the latest for search configuration `config`"""
+        if self.max_entries <= 0:
+            return
+        if config is not None:
+            with self._lock:
+                self._hints[config] = hint if hint is not None else value
+        self._spill(self._insert(key, value))
+    def hint(self, config):
+        with self._lock:
+            return self._hints.get(config)
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hints.clear()
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM entries")
+_default_cache = ProcessLocal(TuningCache)
+def get_tuning_cache():
+    """Per-process tuning cache configured from GOLD_TUNING_CACHE_* environment variables"""
+    return _default_cache.get()
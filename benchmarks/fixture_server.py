@@ -0,0 +1,124 @@
+"""Local stand-in for the Economic Times gold-rate page, with injected latency, jitter and failures.
+
+Serves recorded pages (default benchmarks/data/economictimes_gold.html) on every path. Point the
+app at it with GOLD_RATE_URL; benchmarks/load_test.py starts one for each run.
+
+    python benchmarks/fixture_server.py --port 8800 --latency-ms 300 --jitter-ms 100 --error-rate 0.1
+"""
+import argparse
+import gzip
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from fixtures import PAGE_FIXTURE
+class FixtureServer:
+    """Threaded HTTP server for recorded pages, run in a background thread.
+
+    Every response waits `latency_ms` plus a uniform +/- `jitter_ms`. A request then fails with 503
+    with probability `error_rate`, or has its connection closed without a response with probability
+    `drop_rate`. With several pages and `rotate_seconds` > 0 the served page moves to the next
+    recording every `rotate_seconds`, as the live page changes through the day.
+    """
+    def __init__(self, pages=None, host='127.0.0.1', port=0, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, drop_rate=0.0,
+                 rotate_seconds=0.0, seed=0):
+        self.bodies = []
+        for path in pages or [PAGE_FIXTURE]:
+            with open(path, 'rb') as f:
+                self.bodies.append(f.read())
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.rotate_seconds = rotate_seconds
+        self.counts = {'requests': 0, 'served': 0, 'errors': 0, 'dropped': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/markets/gold-rate-in-india-today"
+    def _outcome(self):
+        """Delay in seconds and what to do with one request: 'serve', 'error' or 'drop'"""
+        with self._lock:
+            self.counts['requests'] += 1
+            delay = max(self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms), 0.0) / 1000
+            draw = self._random.random()
+            outcome = 'error' if draw < self.error_rate else 'drop' if draw < self.error_rate + self.drop_rate else 'serve'
+            self.counts['served' if outcome == 'serve' else 'errors' if outcome == 'error' else 'dropped'] += 1
+        return delay, outcome
+    def page(self):
+        if self.rotate_seconds <= 0:
+            return self.bodies[0]
+        return self.bodies[int((time.monotonic() - self._started) / self.rotate_seconds) % len(self.bodies)]
+    def _handler(self):
+        server = self
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            def do_GET(self):
+                delay, outcome = server._outcome()
+                time.sleep(delay)
+                if outcome == 'drop':
+                    self.close_connection = True
+                    return
+                if outcome == 'error':
+                    body, status = b'Service Unavailable', 503
+                else:
+                    body, status = server.page(), 200
+                headers = {'Content-Type': 'text/html; charset=utf-8'}
+                if status == 200 and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    body = gzip.compress(body, mtime=0)
+                    headers['Content-Encoding'] = 'gzip'
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            def log_message(self, format, *args):
+                pass
+        return Handler
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        return self
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    def __enter__(self):
+        return self.start()
+    def __exit__(self, *exc):
+        self.stop()
+def add_fault_arguments(parser):
+    parser.add_argument('--pages', nargs='*', default=[PAGE_FIXTURE], help="recorded page files")
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument('--drop-rate', type=float, default=0.0, help="fraction of connections closed without a response")
+    parser.add_argument('--rotate-seconds', type=float, default=0.0, help="seconds before moving to the next recorded page")
+    parser.add_argument('--seed', type=int, default=0)
+def server_from_arguments(args, port=0):
+    return FixtureServer(pages=args.pages, port=port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                         error_rate=args.error_rate, drop_rate=args.drop_rate, rotate_seconds=args.rotate_seconds, seed=args.seed)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8800)
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+    server = server_from_arguments(args, port=args.port)
+    print(f"Serving {len(server.bodies)} recorded page(s) at {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    print(f"Requests: {server.counts}")
+    return 0
+if __name__ == '__main__':
+    sys.exit(main())
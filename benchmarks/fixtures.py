@@ -0,0 +1,73 @@
+"""Offline inputs for the benchmarks: an Economic Times page fixture, the notebook data and synthetic series."""
+import os
+import sys
+import numpy as np
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from api.scrapers import ScraperBackend, parse_gold_page
+FIXTURE_DIR = os.path.join(ROOT, 'benchmarks', 'data')
+PAGE_FIXTURE = os.path.join(FIXTURE_DIR, 'economictimes_gold.html')
+def _rupees(value):
+    return f"₹{value:,.0f}" if float(value).is_integer() else f"₹{value:,.2f}"
+def gold_page(daily, monthly):
+    """Render records as the two tables the scrapers read, in the page's markup.
+
+    `daily` holds {'Date', 'Price_per_gram'} and `monthly` the scraped monthly columns; the 24K cell
+    carries the price per 10 grams, as on the live page.
+    """
+    daily_rows = ''.join(
+        f'<tr><td>{row["Date"]}</td><td><span class="text">{_rupees(round(row["Price_per_gram"] * 10 * 22 / 24))}</span></td>'
+        f'<td><span class="arrow up"></span><span class="text">{_rupees(row["Price_per_gram"] * 10)}</span></td></tr>'
+        for row in daily)
+    monthly_rows = ''.join(
+        f'<tr><td>{row["Month"]}</td><td>{_rupees(row["Start_per_gram"])}</td><td>{_rupees(row["End_per_gram"])}</td>'
+        f'<td><span class="chng">{row["Change_Rs"]}</span></td><td><span class="chng">{row["Percent_change"]}</span></td>'
+        f'<td>{_rupees(row["Average_per_gram"])}</td></tr>'
+        for row in monthly)
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Gold Rate in India Today</title></head><body>'
+        '<h2>Gold Rate in India for Last 10 Days (1 gram)</h2>'
+        '<table class="table lg_txt rf_rr"><tr><th>Date</th><th>22 Carat Gold</th><th>24 Carat Gold</th></tr>'
+        f'{daily_rows}</table>'
+        '<div id="monthTrend24c"><table><thead><tr><th>Month</th><th>Start</th><th>End</th><th>Change</th>'
+        f'<th>% Change</th><th>Average</th></tr></thead><tbody>{monthly_rows}</tbody></table></div>'
+        '</body></html>'
+    )
+def notebook_records():
+    """The bundled ML/daily_gold.xlsx and ML/monthly_gold.xlsx as scraped (daily, monthly) records"""
+    import pandas as pd
+    daily = pd.read_excel(os.path.join(ROOT, 'ML', 'daily_gold.xlsx'))
+    monthly = pd.read_excel(os.path.join(ROOT, 'ML', 'monthly_gold.xlsx'))
+    daily['Price_per_gram'] = daily['Price_per_gram'].astype(float)
+    for column in ('Start_per_gram', 'End_per_gram', 'Average_per_gram'):
+        monthly[column] = monthly[column].astype(float)
+    return daily.to_dict(orient='records'), monthly.to_dict(orient='records')
+def synthetic_prices(n, seed=0):
+    """Seeded daily random walk around the notebook's price level"""
+    rng = np.random.default_rng(seed)
+    return np.round(7000 + np.cumsum(rng.normal(0, 20, n)), 1)
+def synthetic_records(n, seed=0):
+    """`n` consecutive days of synthetic daily records, newest first like the page"""
+    import pandas as pd
+    dates = pd.date_range(end='2025-05-29', periods=n, freq='D').strftime('%b %d, %Y')
+    prices = synthetic_prices(n, seed)
+    return [{'Date': date, 'Price_per_gram': float(price)} for date, price in zip(dates[::-1], prices[::-1])]
+def write_page_fixture(path=PAGE_FIXTURE):
+    """Regenerate the page fixture from the notebook data"""
+    daily, monthly = notebook_records()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(gold_page(daily, monthly))
+def read_page_fixture(path=PAGE_FIXTURE):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+class FixtureScraperBackend(ScraperBackend):
+    """Serves the tables from an HTML fixture instead of the network"""
+    name = 'fixture'
+    def __init__(self, html=None):
+        self.html = html if html is not None else read_page_fixture()
+    def fetch_tables(self):
+        return parse_gold_page(self.html)
+if __name__ == '__main__':
+    write_page_fixture()
+    print(f"Wrote {PAGE_FIXTURE}")
@@ -0,0 +1,65 @@
+"""Cold-start import benchmark based on `python -X importtime`.
+
+Exits non-zero when a module's cumulative import time exceeds its budget, or when a
+dependency that should load lazily is imported eagerly.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 250 --json import_time.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = ('api.app', 'api.server', 'api.gold_forecaster')
+LAZY_DEPENDENCIES = ('pandas', 'selenium', 'webdriver_manager', 'statsmodels', 'sklearn', 'requests', 'bs4')
+def measure(module, repeat=5):
+    """Best-of-`repeat` cumulative import time (seconds) and per-module self times from the fastest run"""
+    best_total, best_modules = None, None
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                   cwd=ROOT, capture_output=True, text=True, check=True)
+        modules = {}
+        total = None
+        for line in completed.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            modules[name.strip()] = int(self_us) / 1e6
+            if name.strip() == module:
+                total = int(cumulative_us) / 1e6
+        if best_total is None or total < best_total:
+            best_total, best_modules = total, modules
+    return best_total, best_modules
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--budget-ms', type=float, default=float(os.environ.get('GOLD_IMPORT_BUDGET_MS', 400)))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--json', dest='json_path')
+    args = parser.parse_args(argv)
+    failures = []
+    report = {}
+    for module in args.modules:
+        total, modules = measure(module, args.repeat)
+        eager = sorted(dep for dep in LAZY_DEPENDENCIES if dep in modules)
+        heaviest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        report[module] = {'seconds': total, 'budget_seconds': args.budget_ms / 1000, 'eager_lazy_dependencies': eager,
+                          'heaviest': dict(heaviest)}
+        print(f"{module}: {total * 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        for name, seconds in heaviest:
+            print(f"    {seconds * 1000:8.1f} ms  {name}")
+        if total * 1000 > args.budget_ms:
+            failures.append(f"{module} took {total * 1000:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+        if eager:
+            failures.append(f"{module} eagerly imports {', '.join(eager)}")
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+if __name__ == '__main__':
+    sys.exit(main())
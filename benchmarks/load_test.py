@@ -0,0 +1,286 @@
+"""Offline load test of GET /forecast: throughput, latency percentiles, memory per worker and Chrome processes.
+
+The app runs under Gunicorn (or Flask's Werkzeug server with --server werkzeug, where Gunicorn is
+not installed) with its caches in a temp dir and GOLD_RATE_URL pointing at a local
+benchmarks/fixture_server.py, so no network is needed. Each concurrency level keeps that many
+client connections busy for --duration seconds. Every --scenario adds environment variables for
+the app, and runs under every --workers/--threads combination, to compare caching, pooling and
+worker settings in one report. Memory and process counts are read from /proc (Linux only).
+
+    python benchmarks/load_test.py --workers 1 2 --threads 1 4 --concurrency 1 8 32 --json load.json
+    python benchmarks/load_test.py --scenario refresh-1s GOLD_REFRESH_INTERVAL=1 GOLD_CACHE_TTL=0 --latency-ms 300 --error-rate 0.2
+"""
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import numpy as np
+from fixture_server import add_fault_arguments, server_from_arguments
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVERS = ('gunicorn', 'werkzeug')
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+def read_processes():
+    """{pid: (ppid, command name, RSS bytes)} for every visible process, or None without /proc"""
+    if not os.path.isdir('/proc'):
+        return None
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    processes = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+            with open(f'/proc/{entry}/statm') as f:
+                rss_pages = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        name, _, rest = stat.partition('(')[2].rpartition(')')
+        processes[int(entry)] = (int(rest.split()[1]), name, rss_pages * page_size)
+    return processes
+def descendants(processes, root):
+    children = {}
+    for pid, (ppid, _, _) in processes.items():
+        children.setdefault(ppid, []).append(pid)
+    found, pending = [], list(children.get(root, []))
+    while pending:
+        pid = pending.pop()
+        found.append(pid)
+        pending.extend(children.get(pid, []))
+    return found
+class ResourceSampler:
+    """Samples the app's process tree in the background, keeping peak worker RSS and Chrome process counts.
+
+    Workers are the Python children of the server process (Gunicorn's workers), or the server process
+    itself when it has none (Werkzeug). Chrome covers every chrome/chromium/chromedriver descendant.
+    """
+    def __init__(self, root_pid, interval=0.25):
+        self.root_pid = root_pid
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+    def sample(self):
+        processes = read_processes()
+        if processes is None or self.root_pid not in processes:
+            return None
+        tree = descendants(processes, self.root_pid)
+        chrome = [pid for pid in tree if 'chrom' in processes[pid][1].lower()]
+        workers = [pid for pid, (ppid, name, _) in processes.items() if ppid == self.root_pid and 'chrom' not in name.lower()]
+        return {
+            'server_rss': processes[self.root_pid][2],
+            'worker_rss': [processes[pid][2] for pid in workers] or [processes[self.root_pid][2]],
+            'total_rss': processes[self.root_pid][2] + sum(processes[pid][2] for pid in tree),
+            'chrome_processes': len(chrome),
+        }
+    def _run(self):
+        while not self._stop.is_set():
+            sample = self.sample()
+            if sample is not None:
+                self.samples.append(sample)
+            self._stop.wait(self.interval)
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='resource-sampler', daemon=True)
+        self._thread.start()
+        return self
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        if not self.samples:
+            return {'workers': None, 'worker_rss_mb_max': None, 'worker_rss_mb_mean': None, 'total_rss_mb_max': None,
+                    'chrome_processes_max': None, 'chrome_processes_end': None}
+        mb = 1024 * 1024
+        return {
+            'workers': len(self.samples[-1]['worker_rss']),
+            'worker_rss_mb_max': max(max(s['worker_rss']) for s in self.samples) / mb,
+            'worker_rss_mb_mean': float(np.mean([np.mean(s['worker_rss']) for s in self.samples])) / mb,
+            'total_rss_mb_max': max(s['total_rss'] for s in self.samples) / mb,
+            'chrome_processes_max': max(s['chrome_processes'] for s in self.samples),
+            'chrome_processes_end': self.samples[-1]['chrome_processes'],
+        }
+def drive(port, path, concurrency, duration, headers=None, timeout=60):
+    """Keep `concurrency` keep-alive connections issuing GET `path` for `duration` seconds"""
+    results = [[] for _ in range(concurrency)]
+    deadline = time.perf_counter() + duration
+    def client(timings):
+        conn = None
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                conn = conn or http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+                conn.request('GET', path, headers=headers or {})
+                response = conn.getresponse()
+                response.read()
+                status = str(response.status)
+                if response.getheader('Connection', '').lower() == 'close':
+                    conn.close()
+                    conn = None
+            except (OSError, http.client.HTTPException) as e:
+                status = type(e).__name__
+                if conn is not None:
+                    conn.close()
+                conn = None
+            timings.append((time.perf_counter() - started, status))
+        if conn is not None:
+            conn.close()
+    threads = [threading.Thread(target=client, args=(timings,), daemon=True) for timings in results]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    timings = [timing for timings in results for timing in timings]
+    latencies = np.array([seconds for seconds, _ in timings]) * 1000
+    statuses = {}
+    for _, status in timings:
+        statuses[status] = statuses.get(status, 0) + 1
+    percentiles = np.percentile(latencies, [50, 90, 99]) if len(latencies) else [None] * 3
+    return {
+        'requests': len(timings),
+        'seconds': elapsed,
+        'throughput': len(timings) / elapsed,
+        'latency_ms': {'mean': float(latencies.mean()) if len(latencies) else None,
+                       'p50': percentiles[0], 'p90': percentiles[1], 'p99': percentiles[2],
+                       'max': float(latencies.max()) if len(latencies) else None},
+        'statuses': statuses,
+        'errors': sum(count for status, count in statuses.items() if status not in ('200', '304')),
+    }
+def server_command(server, workers, threads, port):
+    if server == 'gunicorn':
+        return [sys.executable, '-m', 'gunicorn', 'api.app:app', '--workers', str(workers), '--threads', str(threads),
+                '--bind', f'127.0.0.1:{port}', '--timeout', '120']
+    return [sys.executable, '-m', 'flask', '--app', 'api.app', 'run', '--host', '127.0.0.1', '--port', str(port),
+            '--with-threads', '--no-reload', '--no-debugger']
+def app_environment(tmp, fixture_url, overrides):
+    """The app's environment: state files in `tmp`, the fixture page, HTTP scraping only unless overridden"""
+    env = dict(os.environ)
+    env.update({
+        'GOLD_RATE_URL': fixture_url,
+        'GOLD_SCRAPER_BACKENDS': 'http',
+        'GOLD_CACHE_PATH': os.path.join(tmp, 'cache.sqlite3'),
+        'GOLD_HISTORY_PATH': os.path.join(tmp, 'history.sqlite3'),
+        'GOLD_MODEL_STATE_PATH': os.path.join(tmp, 'state.sqlite3'),
+        'GOLD_SINGLE_FLIGHT_PATH': os.path.join(tmp, 'single_flight.sqlite3'),
+        'PYTHONUNBUFFERED': '1',
+    })
+    env.pop('GOLD_PROFILE_DIR', None)
+    env.update(overrides)
+    return env
+def wait_for_forecast(port, process, log_path, timeout):
+    """Seconds until /forecast first answers 200, polling while the app boots"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            with open(log_path, errors='replace') as f:
+                raise RuntimeError(f"App exited with {process.returncode}:\n{f.read()[-2000:]}")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+            conn.request('GET', '/forecast')
+            status = conn.getresponse().status
+            conn.close()
+            if status == 200:
+                return time.perf_counter() - started
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"/forecast did not answer 200 within {timeout:.0f}s (log: {log_path})")
+def stop_process(process):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+def run_configuration(args, scenario, overrides, workers, threads):
+    """Boot the app for one scenario and worker setting, and drive it at each concurrency level"""
+    with tempfile.TemporaryDirectory() as tmp, server_from_arguments(args) as fixture:
+        port = free_port()
+        log_path = os.path.join(tmp, 'app.log')
+        with open(log_path, 'w') as log:
+            process = subprocess.Popen(server_command(args.server, workers, threads, port), cwd=ROOT, stdout=log,
+                                       stderr=subprocess.STDOUT, env=app_environment(tmp, fixture.url, overrides))
+        try:
+            first_forecast = wait_for_forecast(port, process, log_path, args.boot_timeout)
+            headers = {'Accept-Encoding': args.accept_encoding} if args.accept_encoding else {}
+            runs = []
+            for concurrency in args.concurrency:
+                upstream_before = dict(fixture.counts)
+                sampler = ResourceSampler(process.pid).start()
+                result = drive(port, args.path, concurrency, args.duration, headers=headers)
+                result.update(sampler.stop())
+                result['upstream'] = {key: fixture.counts[key] - upstream_before[key] for key in fixture.counts}
+                result.update({'scenario': scenario, 'workers_setting': workers, 'threads': threads, 'concurrency': concurrency,
+                               'first_forecast_seconds': first_forecast})
+                runs.append(result)
+                print_row(result)
+            return runs
+        finally:
+            stop_process(process)
+def _cell(value, fmt):
+    return format(value, fmt) if value is not None else '-'
+def print_header():
+    print(f"{'scenario':<18}{'w':>3}{'t':>3}{'conc':>6}{'req/s':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}"
+          f"{'errors':>8}{'upstream':>10}{'worker MB':>11}{'chrome':>8}")
+def print_row(result):
+    print(f"{result['scenario']:<18}{result['workers_setting']:>3}{_cell(result['threads'], 'd'):>3}{result['concurrency']:>6}"
+          f"{result['throughput']:>9.1f}{_cell(result['latency_ms']['p50'], '.1f'):>9}{_cell(result['latency_ms']['p90'], '.1f'):>9}"
+          f"{_cell(result['latency_ms']['p99'], '.1f'):>9}{result['errors']:>8}{result['upstream']['requests']:>10}"
+          f"{_cell(result['worker_rss_mb_max'], '.0f'):>11}{_cell(result['chrome_processes_max'], 'd'):>8}", flush=True)
+def environment():
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'cpu_count': os.cpu_count()}
+def parse_scenario(values):
+    name, *assignments = values
+    overrides = {}
+    for assignment in assignments:
+        key, sep, value = assignment.partition('=')
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Expected KEY=VALUE in scenario '{name}', got '{assignment}'")
+        overrides[key] = value
+    return name, overrides
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--server', choices=SERVERS, default='gunicorn')
+    parser.add_argument('--workers', nargs='*', type=int, default=[1])
+    parser.add_argument('--threads', nargs='*', type=int, default=[4])
+    parser.add_argument('--concurrency', nargs='*', type=int, default=[1, 8, 32])
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument('--path', default='/forecast')
+    parser.add_argument('--accept-encoding', default='gzip', help="Accept-Encoding sent by the clients ('' for none)")
+    parser.add_argument('--scenario', nargs='+', action='append', metavar=('NAME', 'KEY=VALUE'),
+                        help="app environment overrides to compare, e.g. --scenario no-cache GOLD_CACHE_TTL=0")
+    parser.add_argument('--boot-timeout', type=float, default=120.0)
+    parser.add_argument('--json', dest='json_path')
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.server == 'gunicorn' and importlib.util.find_spec('gunicorn') is None:
+        parser.error("gunicorn is not installed; install it or pass --server werkzeug")
+    if args.server == 'werkzeug' and args.workers != [1]:
+        parser.error("--server werkzeug runs a single process; use --workers 1")
+    try:
+        scenarios = [parse_scenario(values) for values in args.scenario or [['default']]]
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    report = {'environment': environment(), 'server': args.server, 'runs': []}
+    print_header()
+    for scenario, overrides in scenarios:
+        for workers in args.workers:
+            for threads in args.threads if args.server == 'gunicorn' else [None]:
+                report['runs'].extend(run_configuration(args, scenario, overrides, workers, threads))
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2, default=float)
+    return 0
+if __name__ == '__main__':
+    sys.exit(main())
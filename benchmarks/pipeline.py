@@ -0,0 +1,158 @@
+"""Offline per-stage benchmark of the scrape, parse, tune and serve pipeline.
+
+Stages run against benchmarks/data/economictimes_gold.html, the bundled ML/*.xlsx data and
+synthetic random walks, so no network or browser is needed. Results are written as JSON; with
+--baseline, any stage whose median is more than --tolerance slower than the baseline fails the run.
+
+    python benchmarks/pipeline.py --json pipeline.json
+    python benchmarks/pipeline.py --baseline pipeline.json --tolerance 0.25
+    python benchmarks/pipeline.py --stages fit grid_search --sizes 10000 100000
+    python benchmarks/pipeline.py --stages parse_rows build_frames --page-rows 100000 --frame-sizes 200000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import numpy as np
+from fixtures import FixtureScraperBackend, gold_page, notebook_records, read_page_fixture, synthetic_prices, synthetic_records
+STAGES = ('parse_page', 'parse_rows', 'build_frames', 'fit', 'forecast', 'intervals', 'grid_search', 'end_to_end')
+def measure(fn, repeat):
+    """Run `fn` `repeat` times with its printing suppressed, returning min/median/max seconds"""
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+    return {'min': min(timings), 'median': statistics.median(timings), 'max': max(timings), 'repeat': repeat}
+def page_inputs(page_rows):
+    daily, monthly = notebook_records()
+    yield 'fixture', read_page_fixture()
+    for rows in page_rows:
+        yield f'synthetic-{rows}', gold_page(synthetic_records(rows), monthly * max(rows // len(monthly), 1))
+def bench_parse_page(args):
+    from api.scrapers import parse_gold_page
+    return {name: measure(lambda: parse_gold_page(html), args.repeat) for name, html in page_inputs(args.page_rows)}
+def bench_parse_rows(args):
+    """Text records to numeric rows, i.e. scrape_gold_data minus the fetch"""
+    from api.gold_forecaster import scrape_gold_data
+    from api.scrapers import parse_gold_page
+    results = {}
+    for name, html in page_inputs(args.page_rows):
+        tables = parse_gold_page(html)
+        backend = FixtureScraperBackend(html)
+        backend.fetch_tables = lambda tables=tables: tables
+        results[name] = measure(lambda: scrape_gold_data([backend]), args.repeat)
+    return results
+def bench_build_frames(args):
+    from api.gold_forecaster import build_frames
+    daily, monthly = notebook_records()
+    results = {'notebook': measure(lambda: build_frames(daily, monthly), args.repeat)}
+    for n in args.frame_sizes:
+        records = synthetic_records(n)
+        results[f'synthetic-{n}'] = measure(lambda: build_frames(records, monthly), args.repeat)
+    return results
+def bench_fit(args):
+    from api.gold_forecaster import HoltMethod
+    results = {}
+    for n in args.sizes:
+        values = synthetic_prices(n)
+        results[f'synthetic-{n}'] = measure(lambda: HoltMethod(0.9, 0.1, damped=True, phi=0.9, store_fitted=False).fit(values), args.repeat)
+    return results
+def bench_forecast(args):
+    from api.gold_forecaster import HoltMethod
+    model = HoltMethod(0.9, 0.1, damped=True, phi=0.9, store_fitted=False).fit(synthetic_prices(1000))
+    return {f'steps-{steps}': measure(lambda: model.forecast(steps), args.repeat) for steps in (3, 30, 365)}
+def bench_intervals(args):
+    """Bootstrap bands over --paths simulated paths for the default and a 90-step horizon"""
+    from api.intervals import forecast_interval
+    residuals = np.diff(synthetic_prices(501))
+    return {f'paths-{args.paths}-steps-{steps}': measure(
+                lambda: forecast_interval(np.full(steps, 7000.0), residuals, 0.9, 0.1, 0.9, method='bootstrap', paths=args.paths), args.repeat)
+            for steps in (3, 90)}
+def bench_grid_search(args):
+    from api.gold_forecaster import select_daily_model
+    daily, _ = notebook_records()
+    inputs = {'notebook': np.array([row['Price_per_gram'] for row in reversed(daily)])}
+    inputs.update({f'synthetic-{n}': synthetic_prices(n) for n in args.grid_sizes})
+    return {name: measure(lambda: select_daily_model(values[:-3], values[-3:]), args.repeat) for name, values in inputs.items()}
+def bench_end_to_end(args):
+    """Fixture scrape, history merge, tuning and /forecast through Flask's test client, with state in a temp dir"""
+    from api.scrapers import SCRAPER_BACKENDS
+    SCRAPER_BACKENDS[FixtureScraperBackend.name] = FixtureScraperBackend
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({
+            'GOLD_SCRAPER_BACKENDS': FixtureScraperBackend.name,
+            'GOLD_CACHE_PATH': os.path.join(tmp, 'cache.sqlite3'),
+            'GOLD_HISTORY_PATH': os.path.join(tmp, 'history.sqlite3'),
+            'GOLD_MODEL_STATE_PATH': os.path.join(tmp, 'state.sqlite3'),
+            'GOLD_SINGLE_FLIGHT_PATH': os.path.join(tmp, 'single_flight.sqlite3'),
+            'GOLD_SINGLE_FLIGHT_MAX_AGE': '0',
+            'GOLD_CACHE_TTL': '0',
+        })
+        from api.app import app, refresh_forecast
+        client = app.test_client()
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            first = client.get('/forecast')
+            cold = time.perf_counter() - started
+        if first.status_code != 200:
+            raise RuntimeError(f"/forecast returned {first.status_code}: {first.get_data(as_text=True)[:200]}")
+        etag = first.headers['ETag']
+        return {
+            'cold_first_request': {'min': cold, 'median': cold, 'max': cold, 'repeat': 1},
+            'refresh': measure(refresh_forecast, args.repeat),
+            'forecast_request': measure(lambda: client.get('/forecast'), args.repeat * 10),
+            'forecast_request_gzip': measure(lambda: client.get('/forecast', headers={'Accept-Encoding': 'gzip'}), args.repeat * 10),
+            'forecast_request_columnar': measure(lambda: client.get('/forecast?layout=columnar'), args.repeat * 10),
+            'forecast_revalidate_304': measure(lambda: client.get('/forecast', headers={'If-None-Match': etag}), args.repeat * 10),
+        }
+def environment():
+    """What the numbers were measured on, for sizing hardware from the JSON"""
+    import pandas as pd
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'platform': platform.platform(), 'processor': platform.processor(), 'cpu_count': os.cpu_count()}
+def regressions(report, baseline, tolerance):
+    failures = []
+    for stage, cases in report['stages'].items():
+        for case, timing in cases.items():
+            previous = baseline.get('stages', {}).get(stage, {}).get(case)
+            if previous and timing['median'] > previous['median'] * (1 + tolerance):
+                failures.append(f"{stage}/{case}: {timing['median'] * 1000:.2f} ms vs baseline {previous['median'] * 1000:.2f} ms")
+    return failures
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stages', nargs='*', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--sizes', nargs='*', type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--frame-sizes', nargs='*', type=int, default=[10_000, 100_000])
+    parser.add_argument('--grid-sizes', nargs='*', type=int, default=[365, 10_000])
+    parser.add_argument('--page-rows', nargs='*', type=int, default=[1000])
+    parser.add_argument('--paths', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', dest='json_path')
+    parser.add_argument('--baseline')
+    parser.add_argument('--tolerance', type=float, default=float(os.environ.get('GOLD_BENCH_TOLERANCE', 0.25)))
+    args = parser.parse_args(argv)
+    report = {'environment': environment(), 'stages': {}}
+    for stage in args.stages:
+        report['stages'][stage] = cases = globals()[f'bench_{stage}'](args)
+        for case, timing in cases.items():
+            print(f"{stage:<14}{case:<30}{timing['median'] * 1000:>12.3f} ms  (min {timing['min'] * 1000:.3f}, n={timing['repeat']})")
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+    failures = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = regressions(report, json.load(f), args.tolerance)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Daily parameter search benchmark: candidates evaluated, time and accuracy per search strategy.
+
+Each strategy, with and without early stopping, selects a daily model on the holdout split used by
+process_and_forecast. Its holdout RMSE is compared with exhaustive search without early stopping,
+which is always run as the reference even when it is not one of `--strategies`, and its forecast is
+scored on `--horizon` further points that no strategy sees. Runs offline on ML/daily_gold.xlsx
+plus seeded synthetic random walks. `--points` replaces the daily grid with an evenly spaced one
+over the same bounds, to compare strategies at a finer resolution. `--warm-start` adds variants that
+start from the optimum selected one day earlier, as a refresh does after a tail-only change.
+
+    python benchmarks/search_strategies.py
+    python benchmarks/search_strategies.py --points 60 40 20 --lengths 365 2000 --json search.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from api.gold_forecaster import DAILY_ALPHA_VALUES, DAILY_BETA_VALUES, DAILY_PHI_VALUES
+from api.holt_batch import evaluate_holt_batch, holt_forecast
+from api.search import SEARCH_STRATEGIES
+def load_series(lengths, seeds):
+    """The notebook's daily prices (oldest first) plus seeded random walks around the same price level"""
+    import pandas as pd
+    daily = pd.read_excel(os.path.join(ROOT, 'ML', 'daily_gold.xlsx'))
+    daily['Date'] = pd.to_datetime(daily['Date'], format='%b %d, %Y')
+    series = {'daily_gold.xlsx': daily.sort_values('Date')['Price_per_gram'].to_numpy(dtype=np.float64)}
+    for length in lengths:
+        for seed in range(seeds):
+            rng = np.random.default_rng(seed)
+            series[f'walk-{length}-{seed}'] = 7000 + np.cumsum(rng.normal(0, 20, length))
+    return series
+def grid_values(points):
+    """The daily grid, or `points` evenly spaced values per axis over its bounds"""
+    grids = (DAILY_ALPHA_VALUES, DAILY_BETA_VALUES, DAILY_PHI_VALUES)
+    if not points:
+        return grids
+    return tuple(np.linspace(min(values), max(values), count).tolist() for values, count in zip(grids, points))
+def select(strategy, values, test_size, prune_ratio, grids, start=None):
+    """select_daily_model's rule on one series, also returning how many candidates were scored"""
+    train, test = values[:-test_size], values[-test_size:]
+    alpha_values, beta_values, phi_values = grids
+    def score(alpha, beta, phi):
+        return evaluate_holt_batch(train, test, alpha, beta, phi, prune_ratio=prune_ratio)
+    regular = strategy.search(score, alpha_values, beta_values, start=start)
+    damped = strategy.search(score, alpha_values, beta_values, phi_values, start=start)
+    evaluations = sum(result['evaluations'] for result in (regular, damped) if result is not None)
+    best = regular if regular is not None and (damped is None or regular['rmse'] < damped['rmse']) else damped
+    return best, evaluations
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--strategies', nargs='*', default=list(SEARCH_STRATEGIES))
+    parser.add_argument('--lengths', nargs='*', type=int, default=[60, 365, 2000])
+    parser.add_argument('--seeds', type=int, default=5)
+    parser.add_argument('--points', nargs=3, type=int, metavar=('ALPHA', 'BETA', 'PHI'))
+    parser.add_argument('--test-size', type=int, default=3)
+    parser.add_argument('--horizon', type=int, default=3)
+    parser.add_argument('--prune-ratio', type=float, default=8.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--warm-start', action='store_true')
+    parser.add_argument('--json', dest='json_path')
+    args = parser.parse_args(argv)
+    grids = grid_values(args.points)
+    variants = [(name, None, False) for name in args.strategies] + [(name, args.prune_ratio, False) for name in args.strategies]
+    if args.warm_start:
+        variants += [(name, None, True) for name in args.strategies]
+    def variant_name(name, ratio, warm):
+        return f"{name}{'+prune' if ratio else ''}{'+warm' if warm else ''}"
+    rows = {variant_name(*variant): [] for variant in variants}
+    for series_name, series in load_series(args.lengths, args.seeds).items():
+        values, future = series[:-args.horizon], series[-args.horizon:]
+        reference, _ = select(SEARCH_STRATEGIES['exhaustive'](), values, args.test_size, None, grids)
+        reference_forecast = holt_forecast(values, reference['alpha'], reference['beta'], reference['phi'], steps=args.horizon)
+        reference_forecast_rmse = float(np.sqrt(np.mean((future - reference_forecast) ** 2)))
+        for name, ratio, warm in variants:
+            strategy = SEARCH_STRATEGIES[name]()
+            start = None
+            if warm:
+                previous, _ = select(strategy, values[:-1], args.test_size, ratio, grids)
+                start = (previous['alpha'], previous['beta'], previous['phi'])
+            seconds = None
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                best, evaluations = select(strategy, values, args.test_size, ratio, grids, start=start)
+                elapsed = time.perf_counter() - started
+                seconds = elapsed if seconds is None else min(seconds, elapsed)
+            forecast = holt_forecast(values, best['alpha'], best['beta'], best['phi'], steps=args.horizon)
+            row = {'series': series_name, 'evaluations': evaluations, 'seconds': seconds,
+                   'holdout_rmse': best['rmse'], 'forecast_rmse': float(np.sqrt(np.mean((future - forecast) ** 2))),
+                   'alpha': best['alpha'], 'beta': best['beta'], 'phi': best['phi']}
+            row['holdout_rmse_delta'] = row['holdout_rmse'] - reference['rmse']
+            row['forecast_rmse_delta'] = row['forecast_rmse'] - reference_forecast_rmse
+            rows[variant_name(name, ratio, warm)].append(row)
+    report = {}
+    print(f"{'variant':<20}{'evals/request':>14}{'ms/request':>12}{'holdout dRMSE':>15}{'forecast dRMSE':>16}{'worse holdout':>15}")
+    for variant, results in rows.items():
+        summary = {
+            'evaluations_per_request': float(np.mean([r['evaluations'] for r in results])),
+            'seconds_per_request': float(np.mean([r['seconds'] for r in results])),
+            'mean_holdout_rmse_delta': float(np.mean([r['holdout_rmse_delta'] for r in results])),
+            'mean_forecast_rmse_delta': float(np.mean([r['forecast_rmse_delta'] for r in results])),
+            'worse_holdout_than_exhaustive': int(sum(r['holdout_rmse_delta'] > 1e-9 for r in results)),
+            'series': results,
+        }
+        report[variant] = summary
+        print(f"{variant:<20}{summary['evaluations_per_request']:>14.0f}{summary['seconds_per_request'] * 1000:>12.2f}"
+              f"{summary['mean_holdout_rmse_delta']:>15.4f}{summary['mean_forecast_rmse_delta']:>16.4f}"
+              f"{summary['worse_holdout_than_exhaustive']:>11}/{len(results)}")
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+if __name__ == '__main__':
+    sys.exit(main())
@@ -30,7 +30,22 @@ interface ForecastData {
   daily_alpha: number | string | null;
   daily_beta: number | string | null;
   daily_phi: number | string | null; 
+  generated_at?: string;
 }
+type Columns<T> = { [K in keyof T]: T[K][] };
+interface ColumnarForecastData extends Omit<ForecastData, 'daily_data' | 'monthly_data'> {
+  daily_data: Columns<GoldData>;
+  monthly_data: Partial<Columns<MonthlyGoldData>>;
+}
+const toRows = <T,>(columns: Partial<Columns<T>>): T[] => {
+  const keys = Object.keys(columns) as (keyof T)[];
+  const length = keys.length > 0 ? (columns[keys[0]] as unknown[]).length : 0;
+  return Array.from({ length }, (_, i) => {
+    const row = {} as T;
+    keys.forEach((key) => { row[key] = (columns[key] as T[keyof T][])[i]; });
+    return row;
+  });
+};
 interface UseGoldForecastResult {
   data: ForecastData | null;
   loading: boolean;
@@ -44,12 +59,16 @@ const useGoldForecast = (): UseGoldForecastResult => {
     const fetchForecast = async () => {
       try {
         setLoading(true);
-        const response = await fetch('http://localhost:5001/forecast');
+        const response = await fetch('http://localhost:5001/forecast?layout=columnar');
         if (!response.ok) {
           throw new Error(`HTTP error! status: ${response.status}`);
         }
-        const result: ForecastData = await response.json();
-        setData(result);
+        const result: ColumnarForecastData = await response.json();
+        setData({
+          ...result,
+          daily_data: toRows<GoldData>(result.daily_data),
+          monthly_data: toRows<MonthlyGoldData>(result.monthly_data),
+        });
       } catch (e: any) {
         setError(e.message);
       } finally {
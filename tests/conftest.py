@@ -0,0 +1,17 @@
+import pytest
+from api import app, data_cache, history_store, metrics, model_state, single_flight, tuning_cache
+SINGLETONS = [data_cache._default_cache, history_store._default_store, model_state._default_store,
+              single_flight._default_flight, tuning_cache._default_cache, metrics._registry, app._scheduler]
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """Point every state file at a temporary directory and rebuild the per-process singletons"""
+    monkeypatch.setenv('GOLD_CACHE_PATH', str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setenv('GOLD_HISTORY_PATH', str(tmp_path / 'history.sqlite3'))
+    monkeypatch.setenv('GOLD_MODEL_STATE_PATH', str(tmp_path / 'model_state.sqlite3'))
+    monkeypatch.setenv('GOLD_SINGLE_FLIGHT_PATH', str(tmp_path / 'single_flight.sqlite3'))
+    monkeypatch.delenv('GOLD_TUNING_CACHE_PATH', raising=False)
+    for singleton in SINGLETONS:
+        singleton.reset()
+    yield tmp_path
+    for singleton in SINGLETONS:
+        singleton.reset()
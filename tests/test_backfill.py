@@ -0,0 +1,42 @@
+import json
+import os
+import pandas as pd
+from api import backfill
+def write_snapshot(directory, days=30, monthly=True):
+    os.makedirs(directory, exist_ok=True)
+    dates = pd.date_range('2026-01-01', periods=days).strftime('%b %d, %Y')
+    pd.DataFrame({'Date': dates, 'Price_per_gram': [9000 + 5 * i for i in range(days)]}).to_csv(os.path.join(directory, 'daily.csv'), index=False)
+    if monthly:
+        months = pd.date_range('2025-01-01', periods=12, freq='MS').strftime('%B %y')
+        pd.DataFrame({'Month': months, 'Average_per_gram': [8000 + 50 * i for i in range(12)]}).to_csv(os.path.join(directory, 'monthly.csv'), index=False)
+def output_snapshots(output):
+    rows = []
+    for name in sorted(os.listdir(output)):
+        if name.endswith('.jsonl'):
+            with open(os.path.join(output, name)) as f:
+                rows.extend(json.loads(line)['snapshot'] for line in f)
+    return rows
+def run(inputs, output):
+    return backfill.main([str(inputs), '--output', str(output), '--format', 'jsonl', '--workers', '1', '--chunk-size', '1'])
+def test_failed_snapshots_are_retried_on_resume(tmp_path):
+    write_snapshot(tmp_path / 'in' / 'a')
+    write_snapshot(tmp_path / 'in' / 'b', monthly=False)
+    assert run(tmp_path / 'in', tmp_path / 'out') == 1
+    assert [os.path.basename(key) for key in output_snapshots(tmp_path / 'out')] == ['a']
+    write_snapshot(tmp_path / 'in' / 'b')
+    assert run(tmp_path / 'in', tmp_path / 'out') == 0
+    assert sorted(os.path.basename(key) for key in output_snapshots(tmp_path / 'out')) == ['a', 'b']
+def test_changed_snapshot_replaces_its_row(tmp_path):
+    write_snapshot(tmp_path / 'in' / 'a')
+    write_snapshot(tmp_path / 'in' / 'b')
+    assert run(tmp_path / 'in', tmp_path / 'out') == 0
+    write_snapshot(tmp_path / 'in' / 'a', days=40)
+    assert run(tmp_path / 'in', tmp_path / 'out') == 0
+    assert sorted(os.path.basename(key) for key in output_snapshots(tmp_path / 'out')) == ['a', 'b']
+def test_chunked_csv_reads_match_whole_reads(tmp_path):
+    write_snapshot(tmp_path / 'a', days=250)
+    snapshot = backfill.discover_snapshots([str(tmp_path / 'a')])[str(tmp_path / 'a')]
+    chunked, whole = backfill.load_frames(snapshot, chunk_rows=7), backfill.load_frames(snapshot, chunk_rows=1000)
+    for actual, expected in zip(chunked, whole):
+        pd.testing.assert_frame_equal(actual, expected)
+    assert len(chunked[0]) == 250 and chunked[0]['Price_per_gram'].dtype == 'float64'
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from api.backtest import rolling_origin_backtest
+from api.gold_forecaster import DAILY_ALPHA_VALUES, DAILY_BETA_VALUES, DAILY_PHI_VALUES
+from api.holt_batch import fit_holt_batch, forecast_holt_batch, holt_grid
+@pytest.mark.parametrize('folds, horizon, step', [(1, 3, None), (5, 3, None), (4, 7, 2)])
+def test_backtest_matches_a_refit_per_fold(folds, horizon, step):
+    values = 7000 + np.cumsum(np.random.default_rng(folds).normal(0, 20, 120))
+    alpha, beta, phi = holt_grid(DAILY_ALPHA_VALUES, DAILY_BETA_VALUES, DAILY_PHI_VALUES)
+    result = rolling_origin_backtest(values, alpha, beta, phi, folds=folds, horizon=horizon, step=step)
+    assert result['origins'].tolist() == [len(values) - horizon - k * (step or horizon) for k in reversed(range(folds))]
+    errors = []
+    for fold, origin in enumerate(result['origins']):
+        level, trend = fit_holt_batch(values[:origin], alpha, beta, phi)
+        fold_errors = values[origin:origin + horizon] - forecast_holt_batch(level, trend, phi, horizon)
+        np.testing.assert_allclose(result['fold_rmse'][:, fold], np.sqrt(np.mean(fold_errors ** 2, axis=-1)), rtol=1e-10)
+        np.testing.assert_allclose(result['fold_mae'][:, fold], np.mean(np.abs(fold_errors), axis=-1), rtol=1e-10)
+        errors.append(fold_errors)
+    errors = np.concatenate(errors, axis=-1)
+    np.testing.assert_allclose(result['rmse'], np.sqrt(np.mean(errors ** 2, axis=-1)), rtol=1e-10)
+    np.testing.assert_allclose(result['mae'], np.mean(np.abs(errors), axis=-1), rtol=1e-10)
+def test_short_series_are_rejected():
+    with pytest.raises(ValueError):
+        rolling_origin_backtest(np.arange(4.0), [0.5], [0.1], [1.0], folds=3, horizon=3)
@@ -0,0 +1,43 @@
+import numpy as np
+from api.app import app
+from api.batch_forecast import forecast_many
+from api.gold_forecaster import select_daily_model
+from api.tuning_cache import TuningCache
+def test_malformed_series_get_error_lines():
+    series = [{'name': 'dates-only', 'dates': ['2026-10-01', '2026-10-02']}, {'name': 'string', 'values': '12345'},
+              {'name': 'ok', 'values': [1, 2, 3, 4, 5, 6]}]
+    results = list(forecast_many(series))
+    assert [result['name'] for result in results] == ['dates-only', 'string', 'ok']
+    assert 'error' in results[0] and 'error' in results[1]
+    assert results[2]['forecast'] == [7.0, 8.0, 9.0]
+def test_results_are_yielded_before_later_series_are_read():
+    read = []
+    def series():
+        for name in ('a', 'b'):
+            read.append(name)
+            yield {'name': name, 'values': [1, 2, 3, 4, 5, 6]}
+    results = forecast_many(series())
+    assert next(results)['name'] == 'a' and read == ['a']
+    assert next(results)['name'] == 'b' and read == ['a', 'b']
+def test_selection_matches_the_daily_model_search(monkeypatch):
+    monkeypatch.setenv('GOLD_SEARCH_STRATEGY', 'coarse')
+    values = (7000 + np.cumsum(np.random.default_rng(5).normal(0, 20, 120))).tolist()
+    result = next(forecast_many([{'name': 'walk', 'values': values}]))
+    selection = select_daily_model(np.array(values[:-3]), np.array(values[-3:]))
+    assert (result['alpha'], result['beta'], result['phi'], result['rmse']) == (
+        selection['alpha'], selection['beta'], selection['phi'], selection['rmse'])
+def test_unchanged_series_reuse_the_tuning_cache(monkeypatch):
+    values = (7000 + np.cumsum(np.random.default_rng(6).normal(0, 20, 60))).tolist()
+    cache = TuningCache()
+    first = next(forecast_many([{'values': values}], tuning_cache=cache))
+    monkeypatch.setattr('api.batch_forecast.select_daily_model', lambda *args, **kwargs: None)
+    assert next(forecast_many([{'values': values}], tuning_cache=cache)) == first
+def test_series_with_too_many_observations_are_rejected(monkeypatch):
+    monkeypatch.setenv('GOLD_BATCH_MAX_OBSERVATIONS', '5')
+    response = app.test_client().post('/forecast/batch', json={'series': [{'values': [1, 2, 3, 4, 5, 6]}]})
+    assert response.status_code == 413
+def test_stream_completes_with_a_malformed_series():
+    response = app.test_client().post('/forecast/batch', json={'series': [{'name': 'bad', 'dates': ['2026-10-01']},
+                                                                          {'name': 'ok', 'values': [1, 2, 3, 4, 5, 6]}]})
+    lines = response.get_data(as_text=True).splitlines()
+    assert response.status_code == 200 and len(lines) == 2 and '"error"' in lines[0] and '"forecast"' in lines[1]
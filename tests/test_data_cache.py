@@ -0,0 +1,34 @@
+import threading
+import time
+from api.data_cache import ScrapeCache
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+def test_fresh_entries_are_served_until_the_ttl_expires(tmp_path):
+    cache = ScrapeCache(path=str(tmp_path / 'cache.sqlite3'), ttl=0.2, stale_ttl=0.2)
+    fetches = []
+    def fetch():
+        fetches.append(None)
+        return len(fetches)
+    assert cache.get('key', fetch) == 1
+    assert cache.get('key', fetch) == 1 and len(fetches) == 1
+    time.sleep(0.3)
+    assert cache.get('key', fetch) == 2 and cache.read('key')[0] == 2
+def test_stale_entries_are_served_while_one_background_refresh_runs(tmp_path):
+    cache = ScrapeCache(path=str(tmp_path / 'cache.sqlite3'), ttl=10, stale_ttl=3600)
+    other = ScrapeCache(path=cache.path, ttl=10, stale_ttl=3600)
+    cache.write('key', 'old', fetched_at=time.time() - 60)
+    release, fetches = threading.Event(), []
+    def fetch():
+        fetches.append(None)
+        release.wait(5)
+        return 'new'
+    assert cache.get('key', fetch) == 'old'
+    wait_for(lambda: fetches)
+    assert cache.get('key', fetch) == other.get('key', fetch) == 'old'
+    release.set()
+    wait_for(lambda: cache.read('key')[0] == 'new')
+    assert len(fetches) == 1
+    assert cache._acquire_lease('key')
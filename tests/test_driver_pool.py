@@ -0,0 +1,53 @@
+import threading
+import pytest
+from api.driver_pool import DriverPool
+class FakeDriver:
+    def __init__(self, debug_port):
+        self.debug_port = debug_port
+        self.healthy = True
+        self.quit_called = False
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError("session deleted")
+        return 1
+    def quit(self):
+        self.quit_called = True
+class FakeFactory:
+    def __init__(self):
+        self.drivers = []
+    def __call__(self, debug_port=None):
+        self.drivers.append(FakeDriver(debug_port))
+        return self.drivers[-1]
+def test_sessions_are_reused_then_recycled_after_max_uses():
+    factory = FakeFactory()
+    pool = DriverPool(factory=factory, size=1, max_uses=2, borrow_timeout=1)
+    for _ in range(2):
+        with pool.driver() as driver:
+            assert driver is factory.drivers[0]
+    assert factory.drivers[0].quit_called
+    with pool.driver() as driver:
+        assert driver is factory.drivers[1]
+def test_failed_and_unhealthy_sessions_are_replaced():
+    factory = FakeFactory()
+    pool = DriverPool(factory=factory, size=1, max_uses=10, borrow_timeout=1)
+    with pytest.raises(ValueError):
+        with pool.driver():
+            raise ValueError("page broke")
+    with pool.driver() as driver:
+        driver.healthy = False
+    with pool.driver() as driver:
+        assert driver is factory.drivers[2]
+    assert factory.drivers[0].quit_called and factory.drivers[1].quit_called
+def test_concurrent_sessions_get_unique_debug_ports():
+    factory = FakeFactory()
+    pool = DriverPool(factory=factory, size=4, max_uses=10, borrow_timeout=1)
+    borrowed = [pool.acquire() for _ in range(4)]
+    assert len({pooled.debug_port for pooled in borrowed}) == 4
+    assert [pooled.debug_port for pooled in borrowed] == [driver.debug_port for driver in factory.drivers]
+    with pytest.raises(TimeoutError):
+        DriverPool(factory=factory, size=0, borrow_timeout=0.05).acquire()
+    waiter = threading.Thread(target=lambda: borrowed.append(pool.acquire()))
+    waiter.start()
+    pool.release(borrowed[0])
+    waiter.join(1)
+    assert borrowed[-1] is borrowed[0] and len(factory.drivers) == 4
@@ -0,0 +1,16 @@
+import pandas as pd
+from api.gold_forecaster import build_frames
+from api.history_store import PriceHistoryStore, history_frames
+DAILY = [{'Date': 'Oct 17, 2026', 'Price_per_gram': 101.0}, {'Date': 'Oct 16, 2026', 'Price_per_gram': None}]
+MONTHLY = [{'Month': 'October 26', 'Start_per_gram': 1.0, 'End_per_gram': 2.0, 'Change_Rs': '1', 'Percent_change': '100%',
+            'Average_per_gram': 1.5}]
+def test_history_frames_match_build_frames(tmp_path):
+    daily_df, monthly_df = history_frames(DAILY, MONTHLY, PriceHistoryStore(str(tmp_path / 'history.sqlite3')))
+    expected_daily, expected_monthly = build_frames(DAILY, MONTHLY)
+    pd.testing.assert_frame_equal(daily_df, expected_daily)
+    pd.testing.assert_frame_equal(monthly_df, expected_monthly.drop(columns='Month'))
+def test_history_accumulates_across_scrapes(tmp_path):
+    store = PriceHistoryStore(str(tmp_path / 'history.sqlite3'))
+    history_frames(DAILY, MONTHLY, store)
+    daily_df, _ = history_frames([{'Date': 'Oct 18, 2026', 'Price_per_gram': 102.0}], MONTHLY, store)
+    assert len(daily_df) == 3 and daily_df['Price_per_gram'].tolist()[1:] == [101.0, 102.0]
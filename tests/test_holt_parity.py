@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from api.gold_forecaster import DAILY_ALPHA_VALUES, DAILY_BETA_VALUES, DAILY_PHI_VALUES, HoltMethod
+from api.holt_batch import evaluate_holt_batch, evaluate_holt_batch_parallel, fit_holt_batch, forecast_holt_batch, holt_grid
+holtwinters = pytest.importorskip('statsmodels.tsa.holtwinters')
+def series(length, seed):
+    return 100 + np.cumsum(np.random.default_rng(seed).normal(size=length))
+def statsmodels_forecast(values, alpha, beta, phi, steps):
+    damped = phi is not None
+    model = holtwinters.Holt(values, exponential=False, damped_trend=damped, initialization_method='legacy-heuristic')
+    fitted = model.fit(smoothing_level=alpha, smoothing_trend=beta, damping_trend=phi, optimized=False)
+    return np.asarray(fitted.forecast(steps), dtype=np.float64)
+@pytest.mark.parametrize('length', [3, 10, 60, 400])
+@pytest.mark.parametrize('damped', [False, True])
+def test_batch_kernel_matches_statsmodels_holt(length, damped):
+    """start=0 folds in every observation, which is statsmodels' legacy initialisation with optimized=False"""
+    values = series(length, seed=length)
+    alpha, beta, phi = holt_grid(DAILY_ALPHA_VALUES, DAILY_BETA_VALUES, DAILY_PHI_VALUES if damped else None)
+    picks = np.linspace(0, len(alpha) - 1, 12).astype(int)
+    level, trend = fit_holt_batch(values, alpha[picks], beta[picks], phi[picks], start=0)
+    forecasts = forecast_holt_batch(level, trend, phi[picks], 5)
+    for row, index in enumerate(picks):
+        expected = statsmodels_forecast(values, alpha[index], beta[index], phi[index] if damped else None, 5)
+        np.testing.assert_allclose(forecasts[row], expected, rtol=1e-9, atol=1e-9)
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_batch_kernel_matches_a_per_candidate_holt_method_loop(seed):
+    rng = np.random.default_rng(seed)
+    values = series(int(rng.integers(5, 300)), seed)
+    train, test = values[:-3], values[-3:]
+    alpha, beta, phi = rng.uniform(0.05, 1, 20), rng.uniform(0.01, 0.6, 20), rng.choice([0.8, 0.9, 0.98, 1.0], 20)
+    level, trend = fit_holt_batch(train, alpha, beta, phi)
+    rmse, mae, fitted = evaluate_holt_batch(train, test, alpha, beta, phi)
+    assert fitted.all()
+    for index in range(len(alpha)):
+        model = HoltMethod(alpha=alpha[index], beta=beta[index], damped=True, phi=phi[index], store_fitted=False).fit(train)
+        errors = test - model.forecast(len(test))
+        np.testing.assert_allclose([level[index], trend[index]], [model.level, model.trend], rtol=1e-10, atol=1e-9)
+        np.testing.assert_allclose([rmse[index], mae[index]], [np.sqrt(np.mean(errors ** 2)), np.mean(np.abs(errors))],
+                                   rtol=1e-8, atol=1e-8)
+@pytest.mark.parametrize('phi', [0.8, 0.98, 1.0])
+def test_closed_form_forecast_matches_the_damped_recursion(phi):
+    model = HoltMethod(alpha=0.4, beta=0.2, damped=True, phi=phi, store_fitted=False).fit(series(50, seed=7))
+    level, trend, expected = model.level, model.trend, []
+    for _ in range(30):
+        trend *= phi
+        level += trend
+        expected.append(level)
+    np.testing.assert_allclose(model.forecast(30), expected, rtol=1e-12)
+    np.testing.assert_allclose(forecast_holt_batch([model.level], [model.trend], [phi], 30)[0], expected, rtol=1e-12)
+def test_process_pool_matches_the_serial_evaluation():
+    values = series(200, seed=11)
+    alpha, beta, phi = holt_grid(DAILY_ALPHA_VALUES, DAILY_BETA_VALUES, DAILY_PHI_VALUES)
+    serial = evaluate_holt_batch(values[:-3], values[-3:], alpha, beta, phi)
+    pooled = evaluate_holt_batch_parallel(values[:-3], values[-3:], alpha, beta, phi, workers=2)
+    for expected, actual in zip(serial, pooled):
+        np.testing.assert_array_equal(expected, actual)
@@ -0,0 +1,21 @@
+import importlib.util
+import os
+import subprocess
+import sys
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+def import_time_module():
+    spec = importlib.util.spec_from_file_location('import_time', os.path.join(ROOT, 'benchmarks', 'import_time.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+def test_app_imports_within_budget():
+    import_time = import_time_module()
+    total, _ = import_time.measure('api.app', repeat=3)
+    assert total * 1000 <= float(os.environ.get('GOLD_IMPORT_BUDGET_MS', 400))
+    assert import_time.main(['api.app', '--repeat', '3']) == 0
+def test_app_import_leaves_heavy_dependencies_unloaded():
+    import_time = import_time_module()
+    completed = subprocess.run([sys.executable, '-c', 'import sys, api.app; print("\\n".join(sys.modules))'],
+                               cwd=ROOT, capture_output=True, text=True, check=True)
+    loaded = {name.split('.')[0] for name in completed.stdout.split()}
+    assert not loaded & set(import_time.LAZY_DEPENDENCIES)
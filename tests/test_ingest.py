@@ -0,0 +1,12 @@
+import numpy as np
+import pytest
+from api.ingest import parse_months, parse_prices
+def test_prices_accept_rupee_texts_and_numbers():
+    parsed = parse_prices(['₹95,740.50', '1,000', None, 'N/A', 12.5, 7])
+    np.testing.assert_array_equal(parsed, [95740.5, 1000.0, np.nan, np.nan, 12.5, 7.0])
+    np.testing.assert_array_equal(parse_prices(np.array([1.5, 2.0])), [1.5, 2.0])
+def test_two_digit_years_are_always_in_this_century():
+    parsed = parse_months(['April 25', 'December 70', 'January 99'])
+    assert parsed.astype('datetime64[D]').astype(str).tolist() == ['2025-04-01', '2070-12-01', '2099-01-01']
+    with pytest.raises(ValueError):
+        parse_months(['April 2025'])
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from api.gold_forecaster import HoltMethod
+from api.intervals import forecast_interval
+ALPHA, BETA, PHI = 0.5, 0.1, 0.9
+def holt_series(length, rng):
+    """A series generated by damped Holt's own error-correction recursion with Gaussian errors"""
+    level, trend, values = 7000.0, 2.0, []
+    for error in rng.normal(0, 10, length):
+        forecast = level + PHI * trend
+        values.append(forecast + error)
+        level, trend = forecast + ALPHA * error, PHI * trend + ALPHA * BETA * error
+    return np.array(values)
+@pytest.mark.parametrize('method', ['bootstrap', 'normal'])
+def test_intervals_bracket_the_point_forecast(method):
+    model = HoltMethod(alpha=ALPHA, beta=BETA, damped=True, phi=PHI).fit(holt_series(300, np.random.default_rng(0)))
+    point = model.forecast(10)
+    lower, upper = forecast_interval(point, model.residuals, ALPHA, BETA, PHI, level=0.9, method=method, paths=2000)
+    assert lower.shape == upper.shape == point.shape
+    assert np.all(lower < point) and np.all(point < upper)
+    assert np.all(np.diff(upper - lower) > 0)
+    assert forecast_interval(point, model.residuals[:4], ALPHA, BETA, PHI, method=method) is None
+@pytest.mark.parametrize('method', ['bootstrap', 'normal'])
+def test_intervals_have_roughly_nominal_coverage(method):
+    rng = np.random.default_rng(1)
+    covered = []
+    for _ in range(200):
+        values = holt_series(205, rng)
+        model = HoltMethod(alpha=ALPHA, beta=BETA, damped=True, phi=PHI, store_fitted=False).fit(values[:200])
+        lower, upper = forecast_interval(model.forecast(5), model.residuals, ALPHA, BETA, PHI, level=0.9, method=method, paths=2000)
+        covered.extend((lower <= values[200:]) & (values[200:] <= upper))
+    assert 0.85 <= np.mean(covered) <= 0.95
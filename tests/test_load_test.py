@@ -0,0 +1,14 @@
+import json
+import os
+import subprocess
+import sys
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+def test_load_test_smoke_run_against_the_fixture_server(tmp_path):
+    report_path = tmp_path / 'load.json'
+    subprocess.run([sys.executable, os.path.join(ROOT, 'benchmarks', 'load_test.py'), '--server', 'werkzeug',
+                    '--concurrency', '2', '--duration', '1', '--boot-timeout', '60', '--json', str(report_path)],
+                   cwd=ROOT, capture_output=True, text=True, check=True, timeout=180)
+    report = json.loads(report_path.read_text())
+    [run] = report['runs']
+    assert report['server'] == 'werkzeug' and run['concurrency'] == 2
+    assert run['requests'] > 0 and run['errors'] == 0 and run['latency_ms']['p50'] > 0
@@ -0,0 +1,25 @@
+import re
+from api import app
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-zA-Z_][a-zA-Z0-9_]*="[^"]*"(,[a-zA-Z_][a-zA-Z0-9_]*="[^"]*")*\})? \S+$')
+def samples(text):
+    lines = [line for line in text.splitlines() if not line.startswith('#')]
+    assert all(SAMPLE.match(line) for line in lines), lines
+    return {line.rsplit(' ', 1)[0]: float(line.rsplit(' ', 1)[1]) for line in lines}
+def test_metrics_exposes_request_counters_and_histograms(monkeypatch):
+    monkeypatch.setattr(app, '_scrape_and_forecast', lambda backends=None: None)
+    app.refresh_forecast()
+    client = app.app.test_client()
+    client.get('/')
+    client.get('/')
+    response = client.get('/metrics')
+    text = response.get_data(as_text=True)
+    assert response.status_code == 200 and response.mimetype == 'text/plain'
+    assert '# TYPE gold_refresh_total counter' in text and '# TYPE gold_http_request_duration_seconds histogram' in text
+    values = samples(text)
+    assert values['gold_refresh_total{result="failure"}'] == 1
+    assert values['gold_stage_duration_seconds_count{stage="refresh"}'] == 1
+    labels = 'endpoint="/",method="GET",status="200"'
+    assert values[f'gold_http_request_duration_seconds_count{{{labels}}}'] == 2
+    buckets = [value for name, value in values.items() if name.startswith(f'gold_http_request_duration_seconds_bucket{{{labels}')]
+    assert buckets == sorted(buckets) and buckets[-1] == 2
+    assert values[f'gold_http_request_duration_seconds_bucket{{{labels},le="+Inf"}}'] == 2
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+from api.gold_forecaster import HoltMethod, resume_daily_model, save_daily_model
+from api.model_state import get_model_state_store
+def daily_series(length=600):
+    values = 7000 + np.cumsum(np.random.default_rng(8).normal(0, 20, length))
+    return pd.Series(values, index=pd.date_range('2025-01-01', periods=length))
+def holt(**kwargs):
+    return HoltMethod(alpha=0.5, beta=0.2, damped=True, phi=0.9, store_fitted=False, **kwargs)
+def assert_same_model(actual, expected):
+    np.testing.assert_allclose([actual.level, actual.trend], [expected.level, expected.trend], rtol=1e-12)
+    np.testing.assert_allclose(actual.residuals, expected.residuals, rtol=1e-12)
+    np.testing.assert_allclose(actual.forecast(5), expected.forecast(5), rtol=1e-12)
+    assert actual.nobs == expected.nobs
+def test_update_after_a_resume_matches_a_full_refit():
+    values = daily_series().values
+    resumed = HoltMethod.from_state(holt().fit(values[:450]).get_state()).update(values[450:])
+    assert_same_model(resumed, holt().fit(values))
+def test_resume_daily_model_advances_the_saved_state():
+    series = daily_series()
+    store = get_model_state_store()
+    selection = {'method': "Damped", 'alpha': 0.5, 'beta': 0.2, 'phi': 0.9, 'rmse': 1.0, 'mae': 1.0}
+    save_daily_model(store, holt().fit(series.values[:-10]), selection, series[:-10])
+    model, resumed_selection = resume_daily_model(store, series)
+    assert_same_model(model, holt().fit(series.values))
+    assert resumed_selection['nobs'] == len(series) - 10
+    revised = series.copy()
+    revised.iloc[100] += 1
+    assert resume_daily_model(store, revised) is None
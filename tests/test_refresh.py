@@ -0,0 +1,39 @@
+import time
+from api import app, gold_forecaster
+from api.data_cache import ScrapeCache, get_default_cache
+def daily(price):
+    return [{'Date': 'Oct 18, 2026', 'Price_per_gram': price}]
+MONTHLY = [{'Month': 'October 26', 'Start_per_gram': 1.0, 'End_per_gram': 1.0, 'Change_Rs': '0', 'Percent_change': '0', 'Average_per_gram': 1.0}]
+def test_refresh_publishes_the_scrape_it_triggered(monkeypatch):
+    cache = get_default_cache()
+    cache.write('economictimes', {'daily': daily(100.0), 'monthly': MONTHLY}, fetched_at=time.time() - cache.ttl - 1)
+    scrapes = []
+    def scrape(backends=None):
+        scrapes.append(backends)
+        return daily(200.0), MONTHLY
+    monkeypatch.setattr(gold_forecaster, 'scrape_gold_data', scrape)
+    monkeypatch.setattr(app, 'process_and_forecast', lambda daily_data, monthly_data, **kwargs: {'daily_data': daily_data})
+    monkeypatch.setenv('GOLD_HISTORY_ENABLED', '0')
+    assert app.refresh_forecast() == {'daily_data': daily(200.0)}
+    assert len(scrapes) == 1
+    assert cache.read('economictimes')[0]['daily'] == daily(200.0)
+def test_requests_still_serve_stale_entries(tmp_path):
+    cache = ScrapeCache(path=str(tmp_path / 'stale.sqlite3'), ttl=10)
+    cache.write('key', 'old', fetched_at=time.time() - 60)
+    assert cache.get('key', lambda: None) == 'old'
+    assert cache.get('key', lambda: 'new', allow_stale=False) == 'new'
+def test_fresh_fetch_falls_back_to_the_expired_entry(tmp_path):
+    cache = ScrapeCache(path=str(tmp_path / 'stale.sqlite3'), ttl=10)
+    cache.write('key', 'old', fetched_at=time.time() - 60)
+    assert cache.get('key', lambda: None, allow_stale=False) == 'old'
+def test_history_refresh_returns_only_the_scraped_window(monkeypatch):
+    scrapes = iter([daily(200.0), [{'Date': 'Oct 19, 2026', 'Price_per_gram': 201.0}]])
+    monkeypatch.setattr(gold_forecaster, 'scrape_gold_data', lambda backends=None: (next(scrapes), MONTHLY))
+    seen = []
+    def forecast(daily_df, monthly_df, *args, data_rows=None, **kwargs):
+        seen.append(len(daily_df))
+        return {'daily_data': daily_df.tail(data_rows[0]).index.tolist()}
+    monkeypatch.setattr(app, 'forecast_frames', forecast)
+    monkeypatch.setenv('GOLD_CACHE_TTL', '0')
+    app._scrape_and_forecast()
+    assert len(app._scrape_and_forecast()['daily_data']) == 1 and seen == [1, 2]
@@ -0,0 +1,35 @@
+import datetime
+from types import SimpleNamespace
+import pytest
+from api import app
+from api.response_cache import PreparedResponse
+from api.scheduler import ForecastSnapshot
+@pytest.mark.parametrize('header, expected', [
+    ('gzip, deflate', 'gzip'),
+    ('gzip;q=0', 'identity'),
+    ('gzip;q=0.0, deflate', 'identity'),
+    ('gzip; q=0', 'identity'),
+    ('GZIP;Q=0.5', 'gzip'),
+    ('*', 'gzip'),
+    ('*;q=0', 'identity'),
+    ('identity', 'identity'),
+    ('', 'identity'),
+    (None, 'identity'),
+])
+def test_negotiate_honours_quality_values(header, expected, monkeypatch):
+    monkeypatch.setattr('api.response_cache._brotli', lambda: None)
+    assert PreparedResponse.negotiate(header) == expected
+def test_negotiate_prefers_brotli_only_at_equal_quality(monkeypatch):
+    monkeypatch.setattr('api.response_cache._brotli', lambda: object())
+    assert PreparedResponse.negotiate('gzip, br') == 'br'
+    assert PreparedResponse.negotiate('gzip;q=1, br;q=0.5') == 'gzip'
+    assert PreparedResponse.negotiate('br;q=0, gzip') == 'gzip'
+def test_forecast_honours_weak_if_none_match(monkeypatch):
+    snapshot = ForecastSnapshot({'daily_forecast': [1.0]}, datetime.datetime(2026, 10, 18, tzinfo=datetime.timezone.utc))
+    monkeypatch.setattr(app, 'get_scheduler', lambda: SimpleNamespace(snapshot=snapshot))
+    client = app.app.test_client()
+    etag = client.get('/forecast').headers['ETag']
+    assert client.get('/forecast', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/forecast', headers={'If-None-Match': 'W/' + etag}).status_code == 304
+    assert client.get('/forecast', headers={'If-None-Match': '"other", W/' + etag}).status_code == 304
+    assert client.get('/forecast', headers={'If-None-Match': '"other"'}).status_code == 200
@@ -0,0 +1,19 @@
+import datetime
+import pytest
+from api.scheduler import CronSchedule
+@pytest.mark.parametrize('expression, moment, expected', [
+    ('0 9 1 * 1', datetime.datetime(2026, 10, 1, 9, 0), True),
+    ('0 9 1 * 1', datetime.datetime(2026, 10, 19, 9, 0), True),
+    ('0 9 1 * 1', datetime.datetime(2026, 10, 20, 9, 0), False),
+    ('0 9 1 * *', datetime.datetime(2026, 10, 19, 9, 0), False),
+    ('0 9 * * 1', datetime.datetime(2026, 10, 1, 9, 0), False),
+    ('0 9 */2 * 1', datetime.datetime(2026, 10, 12, 9, 0), False),
+    ('0 9 */2 * 1', datetime.datetime(2026, 10, 17, 9, 0), False),
+    ('0 9 */2 * 1', datetime.datetime(2026, 10, 5, 9, 0), True),
+])
+def test_day_of_month_and_weekday_follow_the_cron_rule(expression, moment, expected):
+    assert CronSchedule(expression).matches(moment) is expected
+def test_next_after_takes_the_earlier_of_the_two_days():
+    schedule = CronSchedule('30 6 15 * 0')
+    assert schedule.next_after(datetime.datetime(2026, 10, 12, 0, 0)) == datetime.datetime(2026, 10, 15, 6, 30)
+    assert schedule.next_after(datetime.datetime(2026, 10, 15, 7, 0)) == datetime.datetime(2026, 10, 18, 6, 30)
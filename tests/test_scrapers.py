@@ -0,0 +1,42 @@
+import gzip
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from api.scrapers import HttpScraperBackend
+PAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'data', 'economictimes_gold.html')
+@pytest.fixture
+def page_url():
+    """Serves the recorded page gzip-compressed with a chunked body, behind a redirect"""
+    with open(PAGE, 'rb') as f:
+        body = gzip.compress(f.read())
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        def do_GET(self):
+            if self.path != '/gold':
+                self.send_response(302)
+                self.send_header('Location', '/gold')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for offset in range(0, len(body), 1000):
+                chunk = body[offset:offset + 1000]
+                self.wfile.write(b'%x\r\n' % len(chunk) + chunk + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+        def log_message(self, format, *args):
+            pass
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+def test_url_is_read_when_fetching(page_url, monkeypatch):
+    backend = HttpScraperBackend()
+    monkeypatch.setenv('GOLD_RATE_URL', page_url)
+    tables = backend.fetch_tables()
+    assert tables['daily'] and tables['monthly']
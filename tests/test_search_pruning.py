@@ -0,0 +1,26 @@
+import numpy as np
+from api.gold_forecaster import DAILY_ALPHA_VALUES, DAILY_BETA_VALUES, DAILY_PHI_VALUES
+from api.holt_batch import evaluate_holt_batch, fit_holt_batch, fit_holt_pruned, holt_grid
+from api.search import ExhaustiveSearch
+def series(length=400):
+    return 7000 + np.cumsum(np.random.default_rng(3).normal(0, 20, length))
+def test_pruned_fit_matches_the_full_fit_for_survivors():
+    values = series()
+    alpha, beta, phi = holt_grid(DAILY_ALPHA_VALUES, DAILY_BETA_VALUES, DAILY_PHI_VALUES)
+    survivors, level, trend = fit_holt_pruned(values, alpha, beta, phi, prune_ratio=2.0)
+    full_level, full_trend = fit_holt_batch(values, alpha, beta, phi)
+    assert 0 < len(survivors) < len(alpha)
+    np.testing.assert_allclose(level, full_level[survivors], rtol=1e-12)
+    np.testing.assert_allclose(trend, full_trend[survivors], rtol=1e-12, atol=1e-9)
+def test_evaluations_count_only_candidates_fitted_in_full():
+    values = series()
+    def score(alpha, beta, phi):
+        return evaluate_holt_batch(values[:-3], values[-3:], alpha, beta, phi, prune_ratio=2.0)
+    result = ExhaustiveSearch().search(score, DAILY_ALPHA_VALUES, DAILY_BETA_VALUES, DAILY_PHI_VALUES)
+    fitted = score(*holt_grid(DAILY_ALPHA_VALUES, DAILY_BETA_VALUES, DAILY_PHI_VALUES))[2]
+    assert result['evaluations'] == np.count_nonzero(fitted) < len(fitted)
+def test_unpruned_evaluation_marks_every_candidate_fitted():
+    values = series()
+    alpha, beta, phi = holt_grid(DAILY_ALPHA_VALUES, DAILY_BETA_VALUES, DAILY_PHI_VALUES)
+    rmse, mae, fitted = evaluate_holt_batch(values[:-3], values[-3:], alpha, beta, phi)
+    assert fitted.all() and fitted.shape == rmse.shape == mae.shape
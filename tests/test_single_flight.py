@@ -0,0 +1,48 @@
+import threading
+import time
+from api.single_flight import SingleFlight
+def test_concurrent_callers_share_one_call(tmp_path):
+    flight = SingleFlight(path=str(tmp_path / 'flight.sqlite3'), timeout=5)
+    started, release, calls, results = threading.Event(), threading.Event(), [], []
+    def compute():
+        calls.append(None)
+        started.set()
+        release.wait(5)
+        return 'result'
+    leader = threading.Thread(target=lambda: results.append(flight.do('key', compute)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do('key', compute))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+    assert results == ['result'] * 5 and len(calls) == 1
+    assert flight.last_good('key') == 'result'
+def test_failures_are_shared_but_not_published(tmp_path):
+    flight = SingleFlight(path=str(tmp_path / 'flight.sqlite3'), timeout=5, max_age=0)
+    flight.do('key', lambda: 'good')
+    assert flight.do('key', lambda: None) is None
+    assert flight.last_good('key') == 'good'
+def test_waiters_fall_back_to_the_last_good_result_on_timeout(tmp_path):
+    path = str(tmp_path / 'flight.sqlite3')
+    flight = SingleFlight(path=path, timeout=0.1, max_age=0)
+    other_process = SingleFlight(path=path, timeout=0.1, max_age=0)
+    flight.do('key', lambda: 'good')
+    started, release = threading.Event(), threading.Event()
+    def slow():
+        started.set()
+        release.wait(5)
+        return 'late'
+    leader = threading.Thread(target=lambda: flight.do('key', slow))
+    leader.start()
+    started.wait(5)
+    try:
+        assert flight.do('key', lambda: 'unused') == 'good'
+        assert other_process.do('key', lambda: 'unused') == 'good'
+    finally:
+        release.set()
+        leader.join(5)
+    assert flight.last_good('key') == 'late'
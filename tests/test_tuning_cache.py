@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+from api import gold_forecaster
+from api.gold_forecaster import forecast_frames, select_daily_model
+from api.metrics import get_metrics
+from api.model_state import get_model_state_store
+from api.tuning_cache import TuningCache
+def daily_frame(length, seed=4):
+    values = 7000 + np.cumsum(np.random.default_rng(seed).normal(0, 20, length))
+    return pd.DataFrame({'Price_per_gram': values}, index=pd.date_range('2025-01-01', periods=length, name='Date'))
+def forecast(daily_df, cache, state_store=None):
+    return forecast_frames(daily_df, pd.DataFrame(), state_store, include_data=False, tuning_cache=cache)
+def model_counts():
+    lines = get_metrics().render().splitlines()
+    return {line.split('"')[1]: float(line.split()[-1]) for line in lines if line.startswith('gold_daily_model_total{')}
+def test_memo_hits_and_warm_starts_select_what_a_fresh_search_does(monkeypatch):
+    monkeypatch.setenv('GOLD_SEARCH_STRATEGY', 'exhaustive')
+    cache = TuningCache()
+    first = forecast(daily_frame(300), cache)
+    assert forecast(daily_frame(300), cache) == first == forecast(daily_frame(300), None)
+    grown = daily_frame(301)
+    warm = forecast(grown, cache)
+    cold = select_daily_model(grown['Price_per_gram'].values[:-3], grown['Price_per_gram'].values[-3:])
+    assert (warm['daily_alpha'], warm['daily_beta'], warm['daily_phi'], warm['daily_rmse']) == (
+        cold['alpha'], cold['beta'], cold['phi'], cold['rmse'])
+    assert model_counts() == {'retuned': 3, 'cached': 1}
+def test_warm_start_is_counted_for_strategies_that_use_it(monkeypatch):
+    monkeypatch.setenv('GOLD_SEARCH_STRATEGY', 'coarse')
+    cache = TuningCache()
+    forecast(daily_frame(300), cache)
+    forecast(daily_frame(301), cache)
+    assert model_counts() == {'retuned': 1, 'warm_started': 1}
+def test_memoized_model_keeps_its_tuning_time(monkeypatch):
+    monkeypatch.setenv('GOLD_RETUNE_INTERVAL', '0')
+    cache = TuningCache()
+    monkeypatch.setattr(gold_forecaster.time, 'time', lambda: 1000.0)
+    forecast(daily_frame(100), cache)
+    monkeypatch.setattr(gold_forecaster.time, 'time', lambda: 5000.0)
+    forecast(daily_frame(100), cache, get_model_state_store())
+    assert get_model_state_store().load('daily')['tuned_at'] == 1000.0